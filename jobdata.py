@@ -1,20 +1,33 @@
+import argparse
+import atexit
+import hashlib
 import logging
 import os.path
 import pickle
+import re
 import sys
 import time
-from urllib.parse import parse_qs, urlparse
+from collections import deque
+from datetime import datetime
+from urllib.parse import parse_qs, quote, urlparse
 
-import openpyxl
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+
+from jobdata_checkpoint import CheckpointJournal
+from jobdata_driver import DriverPool, DriverResolver, block_resources, lean_options
+from jobdata_fetch import AsyncFetcher, CircuitBreaker, ListPrefetcher, call_with_retry, plan_pages
+from jobdata_fixture import FixtureArchive
+from jobdata_http import LoginRequired, LoginSession, SessionExpired, cookies_valid, fetch_html, is_login_url, is_transient, load_cookies, make_session
+from jobdata_metrics import Metrics, MetricsReporter, serve_prometheus
+from jobdata_sink import EMAIL_COLUMNS, RESULT_COLUMNS, ExcelSink, export_excel, open_stream_sink
+from jobdata_store import EmailIndex, SeenIndex, content_hash, normalize_emails, now_text
+from jobdata_parser import DETAIL_FIELDS, ParseError, parse_detail, parse_list_items
 
 
 # url param 추출
@@ -28,6 +41,17 @@ def extract_param_value(url):
     else:
         return None
 
+
+# 검색 url 의 파라미터 값 바꾸기 (없던 파라미터는 끝에 붙인다)
+def with_search_params(url, params):
+    for name, value in params.items():
+        pattern = rf"([?&]){re.escape(name)}=[^&]*"
+        if re.search(pattern, url):
+            url = re.sub(pattern, lambda match: f"{match.group(1)}{name}={quote(value)}", url)
+        else:
+            url += f"&{name}={quote(value)}"
+    return url
+
 # 로깅 설정
 logging.basicConfig(filename='my_log_file.txt', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -45,82 +69,69 @@ options.add_argument("headless")
 options.add_argument('--log-level=3')
 options.add_argument('--disable-loging')
 options.add_experimental_option("useAutomationExtension", False)
-service = Service(executable_path=ChromeDriverManager().install())
-
-answer업종 = ""
-answer고용허가제 = ""
-answer직무내용 = ""
-answer모집인원 = ""
-answer근무지 = ""
-answer공고일자 = ""
-answer마감일자 = ""
-answer임금조건 = ""
-answer담당자이름 = ""
-answer담당자전화번호 = ""
-answer담당자휴대폰 = ""
-answer담당자이메일 = ""
-saveFlag = False
+
+# 린 프로필 (수집용 드라이버만) - 이미지/글꼴/CSS/분석 스크립트를 받지 않고 DOMContentLoaded 까지만 기다린 뒤
+# 필요한 요소(목록 .link, 상세 careers-table)가 나타날 때까지 최대 elementWaitSeconds 초 기다린다
+leanBrowser = True
+elementWaitSeconds = 10
+
+# chromedriver 는 처음 브라우저를 띄울 때만 찾고, 브라우저 버전별로 캐시해 오프라인에서도 재사용한다
+driverCachelink = "C:\\jobdata\\chromedriver.json"
+driverResolver = DriverResolver(driverCachelink)
+
+# 상세 페이지 드라이버 풀 설정 (드라이버 수, 드라이버당 최대 사용 횟수, JS 힙 한도 MB)
+detailPoolSize = 1
+driverMaxUses = 50
+driverMaxHeapMB = 512
+
+# 상세/목록 페이지 수집 방식 ("selenium" 또는 "http")
+# http 는 저장된 로그인 쿠키로 requests 세션을 만들어 html 만 받아 파싱한다 (selenium 은 로그인에만 사용)
+fetchMode = "selenium"
+httpPoolSize = 10
+
+# 상세 페이지 html 을 저장할 폴더 (파서 벤치마크용 샘플, None 이면 저장 안 함)
+# python jobdata_parser.py <폴더> 로 파서 속도를 잴 수 있다
+samplePageDir = None
+
+# 받은 목록/상세 응답을 모두 녹화할 폴더 (None 이면 녹화 안 함, --record)
+# python jobdata_fixture.py <폴더> 로 로컬 재생 서버를 띄우고 --site 로 그 서버를 수집할 수 있다
+recordDir = None
+siteRoot = "https://www.work24.go.kr"
+
+# 상세 페이지 동시 수집 수(http 모드)와 호스트별 초당 요청 수 / 순간 허용량
+detailConcurrency = 8
+requestsPerSecond = 4.0
+requestBurst = 4
+
+# 일시적 오류(연결 끊김, 시간 초과, 429/5xx 등) 재시도 횟수와 대기 기준 초 (jitter 를 둔 지수 대기)
+# 응답이 latencyTarget 초보다 느리거나 오류가 나면 동시 수집 수를 줄이고, 빠르면 다시 늘린다
+# 연속 breakerFailures 번 실패하면 breakerResetSeconds 초 동안 요청을 멈춘다
+requestRetries = 3
+retryBackoff = 1.0
+latencyTarget = 2.0
+breakerFailures = 5
+breakerResetSeconds = 60
+
+# 목록 페이지를 미리 받아 둘 페이지 수, 상세 수집을 미리 넘겨 둘 페이지 수
+listPrefetchDepth = 2
+detailLookaheadPages = 1
+
 stopFlag = False
 
-cookiefilelink = "C:\jobdata\worknetlogin.pkl"
-firstfilelink = "C:\jobdata\\firstInfo.txt"
-# 기타 변수 정의
-excelPath = "C:\jobdata\jobData.xlsx"
-excelEmailPath = "C:\jobdata\jobDataEmail.xlsx"
+# 증분 수집 (지난 실행에서 본 가장 최신 공고에 도달하면 페이지 넘기기를 멈춘다)
+incrementalMode = False
 
-workbook = openpyxl.Workbook()
-emailWorkbook = openpyxl.Workbook()
-
-
-# 기존 엑셀 파일이 존재하는 경우 불러오기
-if os.path.exists(excelPath):
-    workbook = openpyxl.load_workbook(excelPath)
-
-if os.path.exists(excelEmailPath):
-    emailWorkbook = openpyxl.load_workbook(excelEmailPath)
-
-# 엑셀 시트 및 컬럼 설정
-sheet = workbook.active
-sheet.column_dimensions['A'].width = 20
-sheet.column_dimensions['B'].width = 50
-sheet.column_dimensions['C'].width = 20
-sheet.column_dimensions['D'].width = 20
-sheet.column_dimensions['E'].width = 50
-sheet.column_dimensions['F'].width = 50
-sheet.column_dimensions['G'].width = 50
-sheet.column_dimensions['H'].width = 20
-sheet.column_dimensions['I'].width = 20
-sheet.column_dimensions['J'].width = 20
-sheet.column_dimensions['K'].width = 20
-sheet.column_dimensions['L'].width = 200
-sheet.print_options.horizontalCentered = True
-sheet.print_options.verticalCentered = True
-sheet['A1'] = "업종"
-sheet['B1'] = "직무내용"
-sheet['C1'] = "모집인원"
-sheet['D1'] = "근무지역"
-sheet['E1'] = "공고일자"
-sheet['F1'] = "마감일자"
-sheet['G1'] = "임금조건"
-sheet['H1'] = "담당자 이름"
-sheet['I1'] = "담당자 전화번호"
-sheet['J1'] = "담당자 휴대폰 번호"
-sheet['K1'] = "수신자 Email 주소"
-sheet['L1'] = "URL 공고 주소"
-maxPagelen = 12
-
-emailSheet = emailWorkbook.active
-emailSheet.print_options.horizontalCentered = True
-emailSheet.print_options.verticalCentered = True
-emailSheet.column_dimensions['A'].width = 50
-emailSheet['A1'] = "수신자 Email 주소"
-
-currPage = input("검색 시작할 페이지 : ")
-maxPagelen = input("검색 종료할 페이지 : ")
-cloDateStdt = input("공고 마감 시작일 : ")
-cloDateEndt = input("공고 마감 종료일 : ")
-regDateStdt = input("공고 등록 시작일 : ")
-regDateEndt = input("공고 등록 종료일 : ")
+# 갱신 실행 (--refresh) - 목록 대신 처리 인덱스에서 마감 전 공고만 다시 받아 내용 해시가 바뀐 공고만 저장
+# refreshPageSize 개씩을 한 페이지로 묶어 체크포인트에 남긴다
+refreshPageSize = 50
+
+# 필터 미리 적용 - 고용허가제 공고만 저장하므로 상세 페이지를 받기 전에 최대한 걸러낸다
+# searchFilters : 검색 url 에 넣을 Work24 상세검색 파라미터 (예: {"foriegn": "Y"}), --search 이름=값 으로도 지정
+# listRequiredText : 목록 행 텍스트에 이 글자가 있는 공고만 상세 페이지를 받는다 (None 이면 모두 받음)
+searchFilters = {}
+listRequiredText = None
+
+cookiefilelink = "C:\jobdata\worknetlogin.pkl"
 
 # 로그인 리다이렉트 URL
 loginRedirectLink = ("https://www.work.go.kr/seekWantedMain.do")
@@ -128,11 +139,282 @@ loginRedirectLink = ("https://www.work.go.kr/seekWantedMain.do")
 # 로그인 URL
 loginMainLink = ("https://www.work24.go.kr/cm/z/b/0210/openLginPage.do?refSite=EAE05&refUrl=/g24Api/g24InterfaceSsoLogin.do?refUrl=/seekWantedMain.do")
 
+# 로그인해야만 볼 수 있는 페이지 (저장된 쿠키가 아직 유효한지 확인용)
+loginCheckLink = ("https://www.work24.go.kr/cm/c/d/0190/retrieveMyPage.do")
+
+# 체크포인트 저널 (--resume 으로 이어서 수집)
+checkpointlink = "C:\\jobdata\\checkpoint.jsonl"
+# 처리한 공고 번호 인덱스 (실행이 바뀌어도 유지)
+seenIndexlink = "C:\\jobdata\\seenIndex.db"
+# 기타 변수 정의
+excelPath = "C:\jobdata\jobData.xlsx"
+excelEmailPath = "C:\jobdata\jobDataEmail.xlsx"
+# 갱신 실행에서 내용이 바뀐 공고를 저장할 엑셀
+excelUpdatePath = "C:\jobdata\jobDataUpdates.xlsx"
+
+# 결과 저장 방식 ("rewrite" : 묶음마다 엑셀 저장, "append" : 실행 중엔 pending 파일에만 덧붙이고 종료 시 한 번 저장,
+# "partition" : 지난 기록은 읽지 않고 실행마다 jobData_parts 폴더에 파트 워크북을 새로 만듦)
+# batch 개수 또는 flush 초가 지나면 모아 둔 행을 저장한다
+# 파트들을 한 파일로 보려면 python jobdata_sink.py C:\jobdata\jobData.xlsx 합칠파일.xlsx
+excelSaveMode = "partition"
+excelBatchSize = 50
+excelFlushSeconds = 60
+
+# 공고 스트림 저장 형식 (None, "csv", "jsonl", "parquet") - 공고마다 파일 끝에 덧붙인다
+# 엑셀 저장 시점 ("live" : 실행 중 저장, "final" : 종료 시 이번 실행 결과(체크포인트 저널)로 한 번에 생성, "off" : 저장 안 함)
+streamFormat = "csv"
+streamPath = f"C:\\jobdata\\jobData.{streamFormat}"
+excelOutput = "live"
+
+# 단계별(목록/상세/파싱/필터/저장) 소요 시간을 JSON 으로 남길 경로 (None 이면 안 남김, --timings)
+# jobdata_bench.py 가 설정별로 비교할 때 읽는다
+timingPath = None
+
+# 지표 - metricsInterval 초마다 로그에 JSON 한 줄, metricsPort 를 주면 /metrics 로 Prometheus 형식 제공
+metricsInterval = 30
+metricsPort = None
+
+# 페이지 계획 - 1 페이지를 먼저 받아 총 건수를 보고 페이지 크기와 페이지 수를 정한다 (--plan)
+# 서버가 받아 주는 가장 큰 크기를 큰 것부터 시도한다
+pagePlanner = False
+plannerPageSizes = [100, 50, 30, 20, 10]
+
+
+# 로그인 크롬 드라이버로 로그인 후 쿠키를 파일로 저장
+def interactive_login():
+    loginDriver = webdriver.Chrome(service=driverResolver.service(), options=optionsLogin)
+
+    try:
+        loginDriver.get(loginMainLink)
+        wait = WebDriverWait(loginDriver, 120)
+    
+        def check_url(loginDriver):
+            return loginRedirectLink in loginDriver.current_url and loginMainLink not in loginDriver.current_url
+        
+            # 조건 함수를 사용하여 기다리기
+        wait.until(check_url)
+    
+        print(loginDriver.current_url)
+    
+        if loginRedirectLink in loginDriver.current_url and loginDriver.current_url != loginMainLink :
+            # 로그인 한 유저 쿠키 정보 파일로 저장
+            pickle.dump(loginDriver.get_cookies(), open(cookiefilelink, "wb"))
+            
+    except Exception as e:
+        print(e)
+        pass
+
+    finally:
+        pickle.dump(loginDriver.get_cookies(), open(cookiefilelink, "wb"))
+        loginDriver.close()
+
+    return loginDriver
+
+
+# 저장된 쿠키가 아직 유효하면 로그인 창을 띄우지 않는다
+def login_if_needed(forceLogin=False):
+    if not forceLogin and os.path.exists(cookiefilelink) and cookies_valid(load_cookies(cookiefilelink), loginCheckLink):
+        print("저장된 로그인 쿠키가 유효하여 로그인을 건너뜁니다.")
+        return None
+    return interactive_login()
+
+
+argParser = argparse.ArgumentParser(description="WorkNet 공고 크롤링")
+argParser.add_argument("--resume", action="store_true", help="지난 실행이 멈춘 지점부터 이어서 수집")
+argParser.add_argument("--pages", nargs=2, metavar=("START", "END"), help="검색 시작/종료 페이지")
+argParser.add_argument("--clo-date", nargs=2, metavar=("STDT", "ENDT"), help="공고 마감 시작/종료일")
+argParser.add_argument("--reg-date", nargs=2, metavar=("STDT", "ENDT"), help="공고 등록 시작/종료일")
+argParser.add_argument("--fetch-mode", choices=["selenium", "http"], default=fetchMode, help="상세/목록 페이지 수집 방식")
+argParser.add_argument("--skip-login", action="store_true", help="로그인 창 없이 저장된 쿠키 사용")
+argParser.add_argument("--login-only", action="store_true", help="로그인해서 쿠키만 저장하고 종료")
+argParser.add_argument("--force-login", action="store_true", help="저장된 쿠키가 유효해도 로그인 창을 띄움")
+argParser.add_argument("--shard-output", help="결과를 이 CSV 에만 덧붙이고 엑셀은 저장하지 않음 (jobdata_shard.py 용)")
+argParser.add_argument("--checkpoint", default=checkpointlink, help="체크포인트 저널 경로")
+argParser.add_argument("--record", default=recordDir, metavar="DIR", help="받은 목록/상세 응답을 이 폴더에 녹화")
+argParser.add_argument("--site", default=siteRoot, metavar="URL", help="검색할 사이트 주소 (로컬 재생 서버 등)")
+argParser.add_argument("--data-dir", metavar="DIR", help="체크포인트/처리 인덱스/결과 파일을 이 폴더에 저장")
+argParser.add_argument("--pool-size", type=int, default=detailPoolSize, help="상세 페이지 드라이버 수 (selenium)")
+argParser.add_argument("--concurrency", type=int, default=detailConcurrency, help="상세 페이지 동시 수집 수 (http)")
+argParser.add_argument("--rate", type=float, default=requestsPerSecond, help="호스트별 초당 요청 수")
+argParser.add_argument("--batch-size", type=int, default=excelBatchSize, help="엑셀에 한 번에 저장할 행 수")
+argParser.add_argument("--metrics-port", type=int, default=metricsPort, help="Prometheus 지표를 내보낼 포트")
+argParser.add_argument("--timings", default=timingPath, metavar="PATH", help="단계별 소요 시간을 JSON 으로 저장")
+argParser.add_argument("--full-browser", action="store_true", help="린 프로필 없이 모든 리소스를 받는 브라우저 사용")
+argParser.add_argument("--search", action="append", default=[], metavar="NAME=VALUE", help="검색 url 에 넣을 상세검색 파라미터 (여러 번 가능)")
+argParser.add_argument("--list-require", default=listRequiredText, metavar="TEXT", help="목록 행에 이 글자가 있는 공고만 상세 페이지를 받음")
+argParser.add_argument("--batch-id", help="배치 작업 번호 - 같은 배치의 작업끼리 같은 공고를 한 번만 받음 (jobdata_batch.py 용)")
+argParser.add_argument("--job-name", default="main", help="배치 안에서 이 작업의 이름")
+argParser.add_argument("--incremental", action="store_true", help="지난 실행에서 본 가장 최신 공고에 도달하면 멈춤 (주기적 무인 실행용)")
+argParser.add_argument("--refresh", action="store_true", help="마감 전 공고만 다시 받아 내용이 바뀐 공고를 갱신 엑셀에 저장")
+argParser.add_argument("--plan", action="store_true", help="시작/종료 페이지 대신 총 건수로 수집할 페이지를 계산")
+args = argParser.parse_args()
+
+if args.login_only:
+    loginDriver = login_if_needed(args.force_login)
+    if loginDriver is not None:
+        loginDriver.quit()
+    sys.exit(0)
+
+fetchMode = args.fetch_mode
+incrementalMode = incrementalMode or args.incremental
+leanBrowser = leanBrowser and not args.full_browser
+if leanBrowser:
+    lean_options(options)
+detailPoolSize = args.pool_size
+detailConcurrency = args.concurrency
+requestsPerSecond = args.rate
+excelBatchSize = args.batch_size
+timingPath = args.timings
+metricsPort = args.metrics_port
+fixtureArchive = FixtureArchive(args.record) if args.record else None
+metrics = Metrics()
+metricsReporter = MetricsReporter(metrics, metricsInterval)
+metricsServer = serve_prometheus(metrics, metricsPort) if metricsPort else None
+
+# 저장 파일을 다른 폴더에 모으기 (jobdata_bench.py 처럼 실행마다 새로 시작할 때)
+defaultCheckpoint = args.checkpoint == checkpointlink
+if args.data_dir:
+    if defaultCheckpoint:
+        args.checkpoint = os.path.join(args.data_dir, "checkpoint.jsonl")
+    seenIndexlink = os.path.join(args.data_dir, "seenIndex.db")
+    excelPath = os.path.join(args.data_dir, "jobData.xlsx")
+    excelEmailPath = os.path.join(args.data_dir, "jobDataEmail.xlsx")
+    excelUpdatePath = os.path.join(args.data_dir, "jobDataUpdates.xlsx")
+    streamPath = os.path.join(args.data_dir, f"jobData.{streamFormat}")
+
+# 갱신 실행은 바뀐 공고만 따로 저장하고, 수집 실행의 체크포인트와 섞이지 않게 한다
+refreshMode = args.refresh
+if refreshMode:
+    incrementalMode = False
+    excelPath = excelUpdatePath
+    streamPath = os.path.join(os.path.dirname(streamPath), f"jobDataUpdates.{streamFormat}")
+    if defaultCheckpoint:
+        args.checkpoint = os.path.join(os.path.dirname(args.checkpoint), "refresh.jsonl")
+
+checkpointlink = args.checkpoint
+if args.shard_output:
+    streamFormat = "csv"
+    streamPath = args.shard_output
+    excelOutput = "off"
+
+if excelOutput != "live" and streamFormat is None:
+    raise ValueError("excelOutput 이 live 가 아니면 streamFormat 을 지정해야 합니다.")
+
+# 체크포인트 저널 - 끝낸 페이지/공고와 아직 엑셀에 저장하지 못한 행을 기록
+journal = CheckpointJournal(checkpointlink)
+
+planPages = False
+
+# 증분 실행은 끝나지 않은 체크포인트를 덮어쓰지 않고 이어서 한다 (실패한 공고와 아직 저장하지 못한 행을 잃지 않게)
+if (args.resume or incrementalMode) and journal.load():
+    runParams = journal.params
+    print(f"지난 실행을 이어서 수집합니다. (완료 페이지 {len(journal.completedPages)} 개, 완료 공고 {len(journal.completedPostings)} 건)")
+else:
+    if args.resume:
+        print("이어서 수집할 체크포인트가 없어 새로 시작합니다.")
+
+    # 명령행으로 받지 않은 값만 입력 받는다
+    # 페이지 계획을 쓰면 페이지 범위는 1 페이지를 받아 본 뒤에 정한다
+    # 갱신 실행은 검색하지 않으므로 입력 받지 않고, 페이지 수는 처리 인덱스를 읽은 뒤에 정한다
+    planPages = (pagePlanner or args.plan) and not args.pages and not refreshMode
+    if planPages or refreshMode:
+        currPage, maxPagelen = 1, 1
+    else:
+        currPage, maxPagelen = args.pages or (input("검색 시작할 페이지 : "), input("검색 종료할 페이지 : "))
+    if refreshMode:
+        cloDateStdt = cloDateEndt = regDateStdt = regDateEndt = ""
+    else:
+        cloDateStdt, cloDateEndt = args.clo_date or (input("공고 마감 시작일 : "), input("공고 마감 종료일 : "))
+        regDateStdt, regDateEndt = args.reg_date or (input("공고 등록 시작일 : "), input("공고 등록 종료일 : "))
+
+    runParams = {
+        "currPage": currPage,
+        "maxPagelen": maxPagelen,
+        "cloDateStdt": cloDateStdt,
+        "cloDateEndt": cloDateEndt,
+        "regDateStdt": regDateStdt,
+        "regDateEndt": regDateEndt,
+        "resultCnt": 10,
+        "started": now_text(),
+        "searchFilters": {**searchFilters, **dict(option.split("=", 1) for option in args.search)},
+        "listRequiredText": args.list_require,
+    }
+    if not planPages and not refreshMode:
+        journal.start(runParams)
+
+currPage = runParams["currPage"]
+maxPagelen = runParams["maxPagelen"]
+cloDateStdt = runParams["cloDateStdt"]
+cloDateEndt = runParams["cloDateEndt"]
+regDateStdt = runParams["regDateStdt"]
+regDateEndt = runParams["regDateEndt"]
+# 예전 체크포인트에는 페이지 크기/시작 시각이 없다
+resultCnt = runParams.get("resultCnt", 10)
+runStarted = runParams.get("started") or now_text()
+searchFilters = runParams.get("searchFilters", {})
+listRequiredText = runParams.get("listRequiredText")
+# 지역(codeDepth1Info)만 바꾸면 기본 검색 url 의 세부 지역(codeDepth2Info=11000, 서울)과 어긋나므로 같은 지역 전체로 맞춘다
+if "codeDepth1Info" in searchFilters and "codeDepth2Info" not in searchFilters:
+    searchFilters = {**searchFilters, "codeDepth2Info": searchFilters["codeDepth1Info"]}
+
+# 수신자 이메일 인덱스 - 처음 나온 주소만 이메일 엑셀에 넣는다 (처리 인덱스와 같은 파일)
+emailIndex = EmailIndex(seenIndexlink)
+
+
+# 저널에 남은(엑셀에 못 쓴) 행에서 그 공고에서 처음 나온 주소
+def pending_emails(row):
+    wantedAuthNo = extract_param_value(row[-1]) or row[-1]
+    emailText = row[DETAIL_FIELDS.index("담당자이메일")]
+    firstHere = [email for email in normalize_emails(emailText) if email in emailIndex and emailIndex.first_posting(email) == wantedAuthNo]
+    return firstHere + emailIndex.add(emailText, wantedAuthNo)
+
+
+resultSink = None
+emailSink = None
+streamSink = None
+
+# 엑셀에 저장할 때마다 저널에 남기고 저장 시간 기록
+def on_workbook_flush(sinkName, sink):
+    journal.saved(sinkName)
+    metrics.record("workbook", sink.lastSaveSeconds)
+
+
+if excelOutput == "live":
+    resultSink = ExcelSink(excelPath, RESULT_COLUMNS, batchSize=excelBatchSize, flushSeconds=excelFlushSeconds, mode=excelSaveMode,
+                            onFlush=lambda: on_workbook_flush("result", resultSink))
+    emailSink = ExcelSink(excelEmailPath, EMAIL_COLUMNS, batchSize=excelBatchSize, flushSeconds=excelFlushSeconds, mode=excelSaveMode,
+                           onFlush=lambda: on_workbook_flush("email", emailSink))
+
+    # 지난 실행에서 저장하지 못한 행 다시 넣기
+    for row in journal.pending_rows("result"):
+        resultSink.append(row)
+    for row in journal.pending_rows("email"):
+        for email in pending_emails(row):
+            emailSink.append([email])
+
+    # 비정상 종료 시에도 남은 행 저장
+    atexit.register(resultSink.close)
+    atexit.register(emailSink.close)
+
+if streamFormat is not None:
+    streamSink = open_stream_sink(streamPath, RESULT_COLUMNS, streamFormat)
+    atexit.register(streamSink.close)
+
+    # 지난 실행에서 스트림 파일에 저장됐다고 남기지 못한 행 다시 넣기 (샤드/배치 실행은 이 파일이 유일한 결과)
+    # 마지막 저장 뒤에 이미 파일에 들어간 행은 두 번 들어갈 수 있다 (합칠 때 URL 로 중복 제거)
+    pendingStreamRows = journal.pending_rows("stream")
+    for row in pendingStreamRows:
+        streamSink.append(row)
+    if pendingStreamRows:
+        streamSink.sync()
+        journal.saved("stream")
+
+
 # 검색 페이지 URL
 mainLink = (
     "https://www.work24.go.kr/wk/a/b/1200/retriveDtlEmpSrchList.do?"
     f"basicSetupYn=&careerTo=&keywordJobCd=&occupation=&seqNo=&cloDateEndtParam={cloDateEndt}"
-    "&payGbn=&templateInfo=&rot2WorkYn=&shsyWorkSecd=&srcKeywordParam=&resultCnt=10&"
+    f"&payGbn=&templateInfo=&rot2WorkYn=&shsyWorkSecd=&srcKeywordParam=&resultCnt={resultCnt}&"
     "keywordJobCont=N&cert=&moreButtonYn=Y&minPay=&codeDepth2Info=11000&currentPageNo=1&"
     "eventNo=&mode=&major=&resrDutyExcYn=&eodwYn=&sortField=DATE&staArea=&sortOrderBy=DESC&"
     "keyword=&termSearchGbn=D-0&carrEssYns=&benefitSrchAndOr=O&disableEmpHopeGbn=&actServExcYn=&"
@@ -146,212 +428,472 @@ mainLink = (
     f"&keywordBusiNm=N&preferentialGbn=&rot3WorkYn=&regDateEndtParam={regDateEndt}&pfMatterPreferential=&pageIndex={currPage}&"
     "termContractMmcnt=&careerFrom=&laborHrShortYn="
 )
+mainLink = with_search_params(mainLink.replace("https://www.work24.go.kr", args.site.rstrip("/")), searchFilters)
 
-# 로그인 크롬 드라이버 설정
-loginDriver = webdriver.Chrome(service=service, options=optionsLogin)
+# 녹화 재생(--site 로컬 서버) 중에는 로그인/쿠키 때문에 실제 사이트에 접속하지 않는다
+replaying = args.site.rstrip("/") != siteRoot
 
-try:
-    loginDriver.get(loginMainLink)
-    wait = WebDriverWait(loginDriver, 120)
-    
-    def check_url(loginDriver):
-        return loginRedirectLink in loginDriver.current_url and loginMainLink not in loginDriver.current_url
-        
-        # 조건 함수를 사용하여 기다리기
-    wait.until(check_url)
-    
-    print(loginDriver.current_url)
-    
-    if loginRedirectLink in loginDriver.current_url and loginDriver.current_url != loginMainLink :
-        # 로그인 한 유저 쿠키 정보 파일로 저장
-        pickle.dump(loginDriver.get_cookies(), open(cookiefilelink, "wb"))
-            
-except Exception as e:
-    print(e)
-    pass
+# 로그인 창을 띄워 로그인하고 쿠키 저장
+# (--skip-login 이거나 저장된 쿠키가 유효하면 저장된 쿠키를 그대로 사용)
+loginDriver = None
+if not args.skip_login and not replaying:
+    with metrics.time("login"):
+        loginDriver = login_if_needed(args.force_login)
+
+
+# 페이지 전체 로드 대신 필요한 요소가 생길 때까지만 기다린다 (끝내 없으면 그대로 넘겨 파서가 판단)
+def wait_for_class(targetDriver, className):
+    try:
+        WebDriverWait(targetDriver, elementWaitSeconds).until(EC.presence_of_element_located((By.CLASS_NAME, className)))
+    except TimeoutException:
+        pass
 
-finally:
-    pickle.dump(loginDriver.get_cookies(), open(cookiefilelink, "wb"))
-    loginDriver.close()
 
+# 상세 페이지 html 받기 (selenium) - 풀에서 드라이버를 빌려 접속
+# 로그인 쿠키는 드라이버마다 처음 한 번만 넣는다
+def fetch_detail_selenium(aTagLink):
+    with detailPool.acquire() as driverDetail:
+        loginSession.prime_driver(driverDetail)
+        driverDetail.get(aTagLink)
+        if is_login_url(driverDetail.current_url):
+            raise SessionExpired(driverDetail.current_url)
+        wait_for_class(driverDetail, "careers-table")
 
+        # 필드마다 WebDriver 를 호출하지 않고 html 을 한 번만 받아 파싱한다
+        return driverDetail.page_source
 
-driver = webdriver.Chrome(service=service, options=options)
-driver.get(mainLink)
 
-driver.close()
+def fetch_detail_html(aTagLink):
+    if fetchMode == "http":
+        loginSession.prime_session(httpSession)
+        return fetch_html(httpSession, aTagLink)
+    return fetch_detail_selenium(aTagLink)
 
-if os.path.exists(firstfilelink):
-    firstFile = open(firstfilelink, 'w')  # 'w' 모드는 파일을 비웁니다.
-    firstFile.close()  # 파일을 비운 후에 닫습니다.
 
-# 메인 링크 입력 받기
-for curr in range(int(currPage)+1, int(maxPagelen) + 1):
+# 세션이 만료되었으면 쿠키를 다시 읽어(만료됐으면 다시 로그인) 한 번 더 시도한다
+# 다시 로그인할 수 없으면 LoginRequired 로 수집을 멈춘다
+def fetch_with_login(fetch, url):
+    generation = loginSession.generation
     try:
-        # 메인 WebDriver 생성 및 메인 링크 접속
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.get(mainLink)
+        return fetch(url)
+    except SessionExpired:
+        logging.info(f"로그인 세션 만료 - 쿠키를 다시 확인합니다. {url}")
+        loginSession.refresh(generation)
+        return fetch(url)
+
+
+# 상세 페이지 수집 - html 을 받아 (필요하면 샘플로 저장) 파싱
+def fetch_detail(aTagLink):
+    with metrics.time("detail"):
+        html = fetch_with_login(fetch_detail_html, aTagLink)
+
+    if fixtureArchive is not None:
+        fixtureArchive.record(aTagLink, html)
 
-        # 메인 페이지에서 joblinks 수집
-        joblinks = driver.find_elements(By.CLASS_NAME, 'link')
+    if samplePageDir is not None:
+        samplePath = os.path.join(samplePageDir, f"{extract_param_value(aTagLink) or 'detail'}.html")
+        with open(samplePath, "w", encoding="utf-8") as sampleFile:
+            sampleFile.write(html)
+
+    with metrics.time("parse"):
+        return parse_detail(html)
+
+
+# 검색 목록용 드라이버는 한 번만 띄우고, 상세 페이지는 풀에서 빌려 쓴다
+# http 모드는 브라우저 대신 로그인 쿠키를 넣은 세션 하나로 모든 페이지를 받는다
+driver = None
+httpSession = None
+detailPool = DriverPool(driverResolver.service, options, size=detailPoolSize, maxUses=driverMaxUses, maxHeapMB=driverMaxHeapMB,
+                        onCreate=block_resources if leanBrowser else None)
+
+# 로그인 쿠키는 여기서 한 번만 읽는다
+# 실행 중 세션이 만료되면 쿠키를 다시 확인하고, 로그인 창을 띄울 수 있는 실행이면 다시 로그인한다
+if replaying:
+    loginSession = LoginSession(None, loginRedirectLink)
+else:
+    loginSession = LoginSession(cookiefilelink, loginRedirectLink, checkUrl=loginCheckLink,
+                                relogin=None if args.skip_login else interactive_login)
+
+
+listPrefetcher = None
+
+
+# 다시 로그인할 수 없으면 남은 요청을 보내지 않고 멈춘다 (체크포인트는 남아 --resume 으로 이어서 수집)
+def stop_for_login(error):
+    print(f"{error} 로그인한 뒤 --resume 으로 다시 실행하세요.")
+    logging.error(f"로그인 필요로 수집 중단 : {error}")
+    if listPrefetcher is not None:
+        listPrefetcher.close()
+    detailFetcher.close()
+    sys.exit(1)
+
+
+# 다시 시도할 오류 - 요소 없음(페이지 구조 문제)을 뺀 WebDriver 오류와 requests 연결/응답 오류
+def is_transient_error(error):
+    if isinstance(error, NoSuchElementException):
+        return False
+    return is_transient(error) or isinstance(error, WebDriverException)
+
+
+def on_retry(error):
+    metrics.count("retries")
+
+
+# 목록/상세 수집이 함께 쓰는 차단기 (사이트가 거부하기 시작하면 모든 요청을 잠시 멈춘다)
+siteBreaker = CircuitBreaker(breakerFailures, breakerResetSeconds)
+retryOptions = {
+    "isTransient": is_transient_error,
+    "retries": requestRetries,
+    "backoff": retryBackoff,
+    "breaker": siteBreaker,
+    "onRetry": on_retry,
+}
+
+if fetchMode == "http":
+    httpSession = make_session(poolSize=httpPoolSize)
+    loginSession.prime_session(httpSession)
+    detailFetcher = AsyncFetcher(fetch_detail, concurrency=detailConcurrency, ratePerHost=requestsPerSecond, burst=requestBurst,
+                                 latencyTarget=latencyTarget, **retryOptions)
+else:
+    driver = webdriver.Chrome(service=driverResolver.service(), options=options)
+    if leanBrowser:
+        block_resources(driver)
+    # 드라이버 수보다 많이 돌려도 풀에서 대기만 하므로 동시 실행 수는 풀 크기로 맞춘다
+    detailFetcher = AsyncFetcher(fetch_detail, concurrency=detailPoolSize, ratePerHost=requestsPerSecond, burst=requestBurst,
+                                 latencyTarget=latencyTarget, **retryOptions)
+
+# 1 페이지를 받아 총 건수로 페이지 크기/범위를 정하고, 받은 1 페이지는 목록 수집에 다시 쓴다
+firstPageHtml = None
+
+
+# 목록 페이지 html 받기 - 세션이 만료되었으면 SessionExpired
+def fetch_list_html(pageLink):
+    if fetchMode == "http":
+        loginSession.prime_session(httpSession)
+        return fetch_html(httpSession, pageLink)
+
+    loginSession.prime_driver(driver)
+    driver.get(pageLink)
+    if is_login_url(driver.current_url):
+        raise SessionExpired(driver.current_url)
+    wait_for_class(driver, "link")
+    # 링크마다 WebDriver 를 호출하지 않고 html 을 한 번만 받아 (링크, 행 텍스트) 를 읽는다
+    return driver.page_source
 
-        # joblinks 반복 처리
-        # 공고 자세히 보기 페이지로 이동
-        for linkss in joblinks:
-            driverDetail = webdriver.Chrome(service=service, options=options)
-            
-            aTag = linkss.find_element(By.TAG_NAME, "a")
-            aTagLink = aTag.get_attribute("href")
 
-            wantedAuth = extract_param_value(aTagLink)+'\n'
-            
-            if os.path.exists(firstfilelink):
-                firstFile = open(firstfilelink, 'r+')
-                lines = firstFile.readlines()
-                
-                if wantedAuth in lines:
-                    firstFile.write("duplicated Data \n")
-                    print("중복된 데이터가 있습니다.")
-                    stopFlag = True
-                
-                else:
-                    firstFile.write(wantedAuth)
-            else:
-                firstFile = open(firstfilelink, 'a')
-                firstFile.write(wantedAuth)
-                    
-            firstFile.close()
-            
-            # 로그인한 유저 쿠키 파일을 가지고 크롬 드라이버 쿠키에 추가
-            if os.path.exists(cookiefilelink):
-                workCookies = pickle.load(open(cookiefilelink, "rb"))
-                driverDetail.get(loginRedirectLink)
-                driverDetail.delete_all_cookies()
-                
-                for cookie in workCookies:
-                    # cookie.pop("domain")
-                    driverDetail.add_cookie(cookie)
-
-                driverDetail.get(aTagLink)
-            
+def fetch_first_page(pageSize):
+    pageLink = re.sub(r"pageIndex=\d*", "pageIndex=1", re.sub(r"resultCnt=\d*", f"resultCnt={pageSize}", mainLink))
+    html = fetch_with_login(fetch_list_html, pageLink)
+
+    if fixtureArchive is not None:
+        fixtureArchive.record(pageLink, html)
+    return html
+
+
+if planPages:
+    try:
+        plan = plan_pages(lambda pageSize: call_with_retry(lambda: fetch_first_page(pageSize), **retryOptions), plannerPageSizes)
+    except LoginRequired as e:
+        stop_for_login(e)
+    if plan is None:
+        raise ValueError("검색 결과 총 건수를 읽지 못했습니다. --pages 로 페이지 범위를 지정하세요.")
+
+    resultCnt, pageCount, firstPageHtml = plan
+    currPage, maxPagelen = 1, pageCount + 1
+    runParams.update(currPage=currPage, maxPagelen=maxPagelen, resultCnt=resultCnt)
+    mainLink = re.sub(r"resultCnt=\d*", f"resultCnt={resultCnt}", mainLink)
+    journal.start(runParams)
+    print(f"페이지당 {resultCnt} 건, 총 {pageCount} 페이지를 수집합니다.")
+
+seenIndex = SeenIndex(seenIndexlink)
+logging.info(f"처리한 공고 {len(seenIndex)} 건을 불러왔습니다.")
+
+# 저널에 남긴 뒤 처리 인덱스에 커밋하기 전에 멈췄던 공고 채워 넣기
+for wantedAuthNo in journal.completedPostings:
+    seenIndex.add(wantedAuthNo)
+
+# 갱신 대상 - 마감일이 지나지 않은 공고 (이어서 하면 처음 고른 목록 그대로)
+if refreshMode:
+    refreshTargets = runParams.get("refreshTargets")
+    if refreshTargets is None:
+        refreshTargets = seenIndex.open_postings(datetime.now().strftime("%Y%m%d"))
+        runParams.update(maxPagelen=-(-len(refreshTargets) // refreshPageSize) + 1, refreshTargets=refreshTargets)
+        journal.start(runParams)
+    currPage, maxPagelen = 1, runParams["maxPagelen"]
+    listRequiredText = None
+    print(f"마감 전 공고 {len(refreshTargets)} 건을 다시 받아 바뀐 공고만 저장합니다.")
+
+# 증분 수집 기준 - 같은 검색 조건(페이지 번호, 날짜 범위 제외)의 지난 실행에서 가장 최신 공고
+# 목록이 등록일 내림차순이라 날짜 범위가 바뀌어도 기준 공고는 그대로 쓸 수 있다
+incrementalQuery = re.sub(r"(pageIndex|resultCnt|regDateStdtParam|regDateEndtParam|cloDateStdtParam|cloDateEndtParam)=[^&]*", "", mainLink)
+incrementalKey = "newest:" + hashlib.sha1(incrementalQuery.encode()).hexdigest()
+lastNewest = seenIndex.get_state(incrementalKey) if incrementalMode else None
+newestNo = None
+newestRegDate = None
+if lastNewest:
+    print(f"지난 실행의 최신 공고 {lastNewest['wantedAuthNo']} ({lastNewest['regDate']}) 까지 수집합니다.")
+    # 실패 없이 끝나기 전까지는 끝나지 않은 것으로 남긴다 (다음 실행이 모두 본 페이지에서 일찍 멈춰 실패한 공고를 건너뛰지 않게)
+    if not lastNewest.get("unfinished"):
+        seenIndex.set_state(incrementalKey, {**lastNewest, "unfinished": True})
+
+# 검색 목록 페이지에서 상세 링크 수집 (목록 미리 받기 스레드에서 실행)
+# 갱신 실행은 검색 대신 갱신 대상을 refreshPageSize 개씩 돌려준다
+def fetch_list_page(page):
+    if refreshMode:
+        return [(aTagLink, "") for aTagLink in refreshTargets[(page - 1) * refreshPageSize:page * refreshPageSize]]
+    with metrics.time("list"):
+        return call_with_retry(lambda: fetch_list_links(page), **retryOptions)
+
+
+def fetch_list_links(page):
+    global firstPageHtml
+
+    pageLink = re.sub(r"pageIndex=\d*", f"pageIndex={page}", mainLink)
+    if page == 1 and firstPageHtml is not None:
+        html, firstPageHtml = firstPageHtml, None
+    else:
+        html = fetch_with_login(fetch_list_html, pageLink)
+
+    if fixtureArchive is not None:
+        fixtureArchive.record(pageLink, html)
+    return parse_list_items(html, pageLink)
+
+
+# 배치 작업이면 실패한 공고를 다른 작업/다음 실행이 받을 수 있게 놓아 준다
+def release_claim(aTagLink):
+    if args.batch_id:
+        seenIndex.release(extract_param_value(aTagLink) or aTagLink, args.batch_id, args.job_name)
+
+
+# 한 페이지의 상세 수집 결과를 목록 순서대로 받아 필터/저장
+def process_page(page, targetLinks, futures):
+    global stopFlag, newestNo, newestRegDate
+
+    pageFailed = False
+    try:
+        for aTagLink, future in zip(targetLinks, futures):
             try:
-                elements_careers_table = set(driverDetail.find_elements(By.CLASS_NAME, 'careers-table'))
-                elements_업종_right = driverDetail.find_element(By.CLASS_NAME, 'right')
-                elements_업종_li = elements_업종_right.find_elements(By.TAG_NAME, "li")
-                elements_업종_strong = elements_업종_right.find_element(By.CLASS_NAME, "info").find_elements(By.TAG_NAME, "strong")
-
-                # 업종 정보 수집
-                for idx, val in enumerate(elements_업종_strong):
-                    if val.text == "업종":
-                        answer업종 = elements_업종_li.pop(idx).find_element(By.TAG_NAME, "div").text
-
-                # 나머지 정보 수집
-                for ele in elements_careers_table:
-                    tableTh = ele.find_elements(By.TAG_NAME, "th")
-
-                    for idx, val in enumerate(tableTh):
-                        if val.text == "직무내용":
-                            answers = ele.find_element(By.TAG_NAME, "td")
-                            answer직무내용 = answers.text
-
-                        if val.text == "모집인원":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer모집인원 = answers.pop(idx).text
-
-                        if val.text == "근무예정지":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer근무지 = answers.pop(idx).text
-
-                        if val.text == "임금조건":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer임금조건 = answers.pop(idx).text
-                            
-                        if val.text == "담당자":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer담당자이름 = answers.pop(idx).text
-                            
-                        if val.text == "전화번호":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer담당자전화번호 = answers.pop(idx).text
-                            
-                        if val.text == "휴대폰번호":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer담당자휴대폰 = answers.pop(idx).text
-                            
-                        if val.text == "이메일":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer담당자이메일 = answers.pop(idx).text
-                            
-                        if val.text == "채용공고 등록일시":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer공고일자 = answers.pop(idx).text
-                            
-                        if val.text == "접수마감일":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer마감일자 = answers.pop(idx).text
-
-                        if val.text == "고용허가제":
-                            answers = ele.find_elements(By.TAG_NAME, "td")
-                            answer고용허가제 = answers.pop(idx).text
-
-                            # 고용허가제가 있을 경우 데이터 저장
-                            if answer고용허가제 != " ":
-                                saveFlag = True
-                                assertResult = aTagLink
-                                print(assertResult)
-
-                if saveFlag == True:
-                    if stopFlag == False:
-                        sheet.append([answer업종, answer직무내용, answer모집인원, answer근무지,answer공고일자, answer마감일자, answer임금조건,
-                                                answer담당자이름, answer담당자전화번호, answer담당자휴대폰, answer담당자이메일, assertResult])
-                        emailSheet.append([answer담당자이메일])
-                        
-                        emailWorkbook.save(excelEmailPath)
-                        workbook.save(excelPath)
-                        saveFlag = False
-                    else:
-                        stopFlag = False
-                
-            except NoSuchElementException as e:
-                print(f"요소를 찾을 수 없습니다. 에러: {e.msg}")
+                detail = future.result()
+                metrics.count("postings")
+                filterStarted = time.perf_counter()
+                wantedAuthNo = extract_param_value(aTagLink) or aTagLink
+                contentArgs = (wantedAuthNo, aTagLink, re.sub(r"\D", "", detail["마감일자"])[:8],
+                               content_hash([detail[field] for field in DETAIL_FIELDS] + [detail["고용허가제"]]))
+
+                # 고용허가제가 있을 경우 데이터 저장
+                if detail["고용허가제"].strip():
+                    assertResult = aTagLink
+                    row = [detail[field] for field in DETAIL_FIELDS] + [assertResult]
+                else:
+                    row = None
+                metrics.record("filter", time.perf_counter() - filterStarted)
+
+                if refreshMode:
+                    # 갱신 실행은 내용 해시가 바뀐 공고만 저장한다
+                    # 바뀐 행을 저널에 먼저 남긴 뒤 새 해시를 커밋한다 (사이에 죽어도 --resume 에서 행을 다시 넣는다)
+                    with metrics.time("save"), seenIndex.recording_content(*contentArgs) as changed:
+                        journal.posting(wantedAuthNo, row if changed else None)
+                    if not changed:
+                        metrics.count("unchanged")
+                        continue
+                    metrics.count("changed")
+                else:
+                    # 상세 수집에 성공한 공고만 처리 완료로 기록 (실패한 공고는 다음 실행에서 다시 받는다)
+                    # 저널에 먼저 남긴 뒤 처리 인덱스에 커밋한다 (엑셀 flush 전에 죽으면 --resume 에서 다시 넣는다)
+                    # 다른 샤드 프로세스가 먼저 기록한 공고면 저장하지 않는다
+                    with metrics.time("save"), seenIndex.reserve(wantedAuthNo) as isNew:
+                        if isNew:
+                            journal.posting(wantedAuthNo, row)
+                    if not isNew:
+                        print("중복된 데이터가 있습니다.")
+                        metrics.count("duplicates")
+                        continue
+                    seenIndex.record_content(*contentArgs)
+
+                # 다음 증분 기준은 1 페이지에서 이번에 실제로 저장한 가장 최신 공고 (등록일을 아는 공고)
+                regDate = re.sub(r"\D", "", detail["공고일자"])
+                if page == 1 and newestNo is None and not refreshMode:
+                    newestNo, newestRegDate = wantedAuthNo, regDate
+
+                # 지난 최신 공고보다 먼저 등록된 공고면 이번 페이지까지만 수집
+                if lastNewest and regDate and lastNewest["regDate"] and regDate < lastNewest["regDate"]:
+                    stopFlag = True
+
+                with metrics.time("save"):
+                    if row is not None:
+                        print(aTagLink)
+                        metrics.count("permits")
+                        newEmails = emailIndex.add(detail["담당자이메일"], wantedAuthNo)
+                        if streamSink is not None:
+                            streamSink.append(row)
+                        if resultSink is not None:
+                            resultSink.append(row)
+                            for email in newEmails:
+                                emailSink.append([email])
+
+            except LoginRequired as e:
+                release_claim(aTagLink)
+                stop_for_login(e)
+            except (NoSuchElementException, ParseError) as e:
+                pageFailed = True
+                print(f"요소를 찾을 수 없습니다. 에러: {e}")
+                logging.warning(f"상세 페이지 파싱 실패 {aTagLink} : {e}")
+                metrics.count("errors")
+                release_claim(aTagLink)
                 pass  # 요소를 찾을 수 없으면 패스 
             except Exception as e2:
+                pageFailed = True
                 print(f"에러 요인 {e2}")
+                logging.warning(f"상세 페이지 수집 실패 {aTagLink} : {e2}")
+                metrics.count("errors")
+                release_claim(aTagLink)
                 pass
-            finally:
-                stopFlag = False
-                driverDetail.close()
-        
-        mainLink = mainLink.replace(f"pageIndex={curr-1}", f"pageIndex={curr}")
-        driver.close()
-        
-    except Exception as e:
-        print(f"에러 요인 {e}")
-        pass
-    
+
+        # 실패한 공고가 있는 페이지는 --resume 때 다시 본다
+        if pageFailed:
+            failedPages.add(page)
+        else:
+            journal.page_done(page)
+
     finally:
-        stopFlag = False
-        time.sleep(1)
-        print(f"현재 페이지 {curr-1} 입니다.")
+        print(f"현재 페이지 {page} 입니다.")
         print(f"최대 페이지 {maxPagelen} 입니다.")
-        if os.path.exists(firstfilelink):
-            firstFile = open(firstfilelink, 'r+')
-            firstFile.write(f"현재 페이지 {curr-1} 입니다.\n")    
-            firstFile.close()
+        with metrics.time("save"):
+            seenIndex.commit()
+            if resultSink is not None:
+                resultSink.flush_if_due()
+                emailSink.flush_if_due()
+            if streamSink is not None:
+                streamSink.sync()
+                journal.saved("stream")
+        logging.info(f"현재 페이지 {page} 입니다.")
         print("다음 페이지로 이동합니다.")
-    
-    # if stopFlag:
-    #     break
 
 
+# 목록 페이지는 listPrefetchDepth 페이지 앞서 미리 받고,
+# 상세 수집은 detailLookaheadPages 페이지 분량을 먼저 넘겨 두어 페이지 사이에 쉬는 시간이 없게 한다
+listPrefetcher = ListPrefetcher(fetch_list_page, [page for page in range(int(currPage), int(maxPagelen)) if page not in journal.completedPages], depth=listPrefetchDepth)
+inFlightPages = deque()
+inFlightNos = set()
+# 목록이나 공고 수집에 실패한 페이지 (있으면 체크포인트를 끝내지 않고 남긴다)
+failedPages = set()
+
+for page, listItems, listError in listPrefetcher:
+    if isinstance(listError, LoginRequired):
+        stop_for_login(listError)
+    if listError is not None:
+        print(f"에러 요인 {listError}")
+        logging.warning(f"목록 페이지 {page} 수집 실패 : {listError}")
+        metrics.count("errors")
+        failedPages.add(page)
+        continue
+
+    joblinks = [aTagLink for aTagLink, _ in listItems]
+    rowTexts = dict(listItems)
+
+    # 증분 수집: 지난 실행의 최신 공고가 나오면 그 뒤는 이미 수집한 공고
+    if lastNewest:
+        knownNos = [extract_param_value(aTagLink) for aTagLink in joblinks]
+        if lastNewest["wantedAuthNo"] in knownNos:
+            joblinks = joblinks[:knownNos.index(lastNewest["wantedAuthNo"])]
+            stopFlag = True
+        elif joblinks and not lastNewest.get("unfinished") and all(wantedAuthNo in seenIndex for wantedAuthNo in knownNos):
+            stopFlag = True
+
+    # 중복 공고는 상세 페이지를 받지 않는다 (앞 페이지에서 수집 중인 공고 포함)
+    targetLinks = []
+    for aTagLink in joblinks:
+        wantedAuthNo = extract_param_value(aTagLink) or aTagLink
+
+        if (wantedAuthNo in seenIndex and not refreshMode) or wantedAuthNo in journal.completedPostings or wantedAuthNo in inFlightNos:
+            logging.info(f"duplicated Data {wantedAuthNo}")
+            metrics.count("duplicates")
+            print("중복된 데이터가 있습니다.")
+        elif listRequiredText and listRequiredText not in rowTexts[aTagLink]:
+            # 목록에서 이미 조건에 안 맞는 공고는 상세 페이지를 받지 않는다
+            metrics.count("skipped")
+        elif args.batch_id and not seenIndex.claim(wantedAuthNo, args.batch_id, args.job_name):
+            # 같은 배치의 다른 작업(겹치는 날짜/지역)이 받고 있는 공고
+            logging.info(f"claimed by another job {wantedAuthNo}")
+            metrics.count("duplicates")
+        else:
+            targetLinks.append(aTagLink)
+            inFlightNos.add(wantedAuthNo)
+
+    # 페이지의 상세 링크를 한 번에 넘겨 동시에 받고, 결과는 페이지/목록 순서대로 처리
+    inFlightPages.append((page, targetLinks, detailFetcher.submit(targetLinks)))
+    while len(inFlightPages) > detailLookaheadPages:
+        process_page(*inFlightPages.popleft())
+
+    if stopFlag:
+        break
+
+listPrefetcher.close()
+while inFlightPages:
+    process_page(*inFlightPages.popleft())
+
+if stopFlag:
+    print("이미 수집한 공고에 도달하여 종료합니다.")
+
+
+# 계획한 페이지를 모두 끝냈는지 (이미 수집한 공고에 도달해 멈춘 실행은 그때까지 실패한 페이지가 없으면 끝난 것으로 본다)
+if stopFlag:
+    runFinished = not failedPages
+else:
+    runFinished = all(page in journal.completedPages for page in range(int(currPage), int(maxPagelen)))
+
+# 다음 증분 수집 기준 저장 (1 페이지부터 실패 없이 끝까지 돈 실행만 - 실패한 공고가 기준 뒤에 묻히지 않게)
+# 1 페이지에서 새로 저장한 공고가 없으면 지난 기준을 그대로 두고 끝나지 않음 표시만 지운다
+if incrementalMode and int(currPage) == 1 and runFinished and not failedPages:
+    if newestNo:
+        seenIndex.set_state(incrementalKey, {"wantedAuthNo": newestNo, "regDate": newestRegDate})
+    elif lastNewest:
+        seenIndex.set_state(incrementalKey, {"wantedAuthNo": lastNewest["wantedAuthNo"], "regDate": lastNewest["regDate"]})
+
 # 엑셀 저장 및 WebDriver 종료
-workbook.save(excelPath)
-emailWorkbook.save(excelEmailPath)
+with metrics.time("save"):
+    if resultSink is not None:
+        resultSink.close()
+        emailSink.close()
+
+if streamSink is not None:
+    if excelOutput == "final":
+        # 이어서 한 실행이면 앞선 실행분까지 저널에 모두 남아 있다
+        streamRows = journal.acceptedRows
+        export_excel(streamRows, excelPath, RESULT_COLUMNS, mode=excelSaveMode)
+        export_excel([[email] for email in emailIndex.new_since(runStarted)], excelEmailPath, EMAIL_COLUMNS, mode=excelSaveMode)
+    streamSink.sync()
+    journal.saved("stream")
+    streamSink.close()
+
+# 계획한 페이지를 모두 끝냈을 때만 정상 종료 기록 (다음 --resume 은 새로 시작)
+if runFinished:
+    journal.finish()
+else:
+    journal.close()
+    print("수집하지 못한 페이지/공고가 있어 체크포인트를 남깁니다. --resume 으로 다시 실행하면 이어서 수집합니다.")
+    logging.warning(f"체크포인트를 남김 - 실패한 페이지 {sorted(failedPages)}")
+metricsReporter.close()
+if metricsServer is not None:
+    metricsServer.shutdown()
+if timingPath is not None:
+    metrics.write(timingPath)
 print("종료")
 
-driverDetail.quit()
-loginDriver.quit()
-driver.quit()
+detailFetcher.close()
+seenIndex.close()
+emailIndex.close()
+detailPool.close()
+if loginDriver is not None:
+    loginDriver.quit()
+if driver is not None:
+    driver.quit()
+if httpSession is not None:
+    httpSession.close()
+
+# 체크포인트를 남긴 실행은 실패로 끝내 샤드/배치 실행기가 결과를 합치지 않고 --resume 을 기다리게 한다
+if not runFinished:
+    sys.exit(1)
 
 
 #("https://www.work.go.kr/empInfo/empInfoSrch/list/dtlEmpSrchList.do?"
@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from jobdata_checkpoint import journal_finished
+from jobdata_shard import jobdata_command, merge_outputs
+from jobdata_store import EmailIndex, now_text
+
+
+# 등록일 범위를 days 일씩 나누기 (YYYYMMDD, 끝 날짜 포함)
+def split_dates(startDate, endDate, days):
+    start = datetime.strptime(startDate, "%Y%m%d")
+    end = datetime.strptime(endDate, "%Y%m%d")
+    windows = []
+    while start <= end:
+        windowEnd = min(end, start + timedelta(days=days - 1))
+        windows.append((start.strftime("%Y%m%d"), windowEnd.strftime("%Y%m%d")))
+        start = windowEnd + timedelta(days=1)
+    return windows
+
+
+# 명령줄 옵션으로 (등록일 구간 x 지역) 작업 목록 만들기
+def build_jobs(args):
+    jobs = []
+    for regStdt, regEndt in split_dates(args.reg_date[0], args.reg_date[1], args.split_days):
+        for region in args.regions or [None]:
+            jobs.append({
+                "name": f"{regStdt}-{regEndt}" + (f"-{region}" if region else ""),
+                "cloDate": args.clo_date,
+                "regDate": [regStdt, regEndt],
+                "region": region,
+                "search": dict(item.split("=", 1) for item in args.search),
+                "listRequire": args.list_require,
+            })
+    return jobs
+
+
+def load_spec(path):
+    """작업 명세 JSON 읽기.
+
+    {"workers": 4, "fetchMode": "http",
+     "jobs": [{"name": "seoul-may", "cloDate": ["20240501", "20240630"], "regDate": ["20240501", "20240531"],
+               "region": "11000", "search": {"foriegn": "Y"}, "listRequire": "고용허가", "pages": [1, 11]}]}
+
+    region 은 Work24 지역 코드 (codeDepth1Info, 세부 지역 codeDepth2Info 도 같은 값으로 맞춘다),
+    pages 가 없으면 총 건수로 페이지를 계산한다 (--plan).
+    """
+    with open(path, encoding="utf-8") as specFile:
+        spec = json.load(specFile)
+
+    names = [job["name"] for job in spec["jobs"]]
+    if len(set(names)) != len(names):
+        raise ValueError("작업 이름(name)이 겹칩니다.")
+    return spec
+
+
+def job_paths(baseDir, name):
+    batchDir = os.path.join(baseDir, "batch")
+    return os.path.join(batchDir, f"{name}.csv"), os.path.join(batchDir, f"{name}.jsonl")
+
+
+def job_options(job, state, baseDir, fetchMode, resume):
+    jobOutput, jobCheckpoint = job_paths(baseDir, job["name"])
+    options = [
+        "--clo-date", *job["cloDate"],
+        "--reg-date", *job["regDate"],
+        "--fetch-mode", fetchMode,
+        "--skip-login",
+        "--data-dir", baseDir,
+        "--shard-output", jobOutput,
+        "--checkpoint", jobCheckpoint,
+        "--batch-id", state["batchId"],
+        "--job-name", job["name"],
+    ]
+    if job.get("pages"):
+        options += ["--pages", *map(str, job["pages"])]
+    else:
+        options.append("--plan")
+
+    search = dict(job.get("search") or {})
+    if job.get("region"):
+        search["codeDepth1Info"] = job["region"]
+    for name, value in search.items():
+        options += ["--search", f"{name}={value}"]
+    if job.get("listRequire"):
+        options += ["--list-require", job["listRequire"]]
+
+    if resume:
+        options.append("--resume")
+    elif os.path.exists(jobOutput):
+        # 새로 시작하는 작업은 지난 결과를 비운다
+        os.remove(jobOutput)
+    return options
+
+
+def load_state(statePath, resume):
+    if resume and os.path.exists(statePath):
+        with open(statePath, encoding="utf-8") as stateFile:
+            return json.load(stateFile)
+    return {"batchId": uuid.uuid4().hex, "started": now_text(), "done": []}
+
+
+def save_state(statePath, state):
+    tmpPath = statePath + ".tmp"
+    with open(tmpPath, "w", encoding="utf-8") as stateFile:
+        json.dump(state, stateFile, ensure_ascii=False, indent=2)
+    os.replace(tmpPath, statePath)
+
+
+def main():
+    argParser = argparse.ArgumentParser(description="여러 날짜 구간/지역 검색을 묶어 jobdata.py 를 동시에 실행")
+    argParser.add_argument("--spec", help="작업 명세 JSON (없으면 아래 옵션으로 작업을 만든다)")
+    argParser.add_argument("--clo-date", nargs=2, metavar=("STDT", "ENDT"), help="공고 마감 시작/종료일")
+    argParser.add_argument("--reg-date", nargs=2, metavar=("STDT", "ENDT"), help="공고 등록 시작/종료일")
+    argParser.add_argument("--split-days", type=int, default=7, help="등록일 범위를 며칠씩 나눠 작업으로 만들지")
+    argParser.add_argument("--regions", nargs="+", help="지역 코드 (codeDepth1Info) 마다 작업을 나눈다")
+    argParser.add_argument("--search", action="append", default=[], metavar="NAME=VALUE", help="모든 작업에 넣을 상세검색 파라미터")
+    argParser.add_argument("--list-require", metavar="TEXT", help="목록 행에 이 글자가 있는 공고만 상세 페이지를 받음")
+    argParser.add_argument("--workers", type=int, help="동시에 돌릴 작업 수 (명세의 workers 보다 우선)")
+    argParser.add_argument("--fetch-mode", choices=["selenium", "http"], help="수집 방식 (명세의 fetchMode 보다 우선)")
+    argParser.add_argument("--skip-login", action="store_true", help="로그인 창 없이 저장된 쿠키 사용")
+    argParser.add_argument("--resume", action="store_true", help="끝난 작업은 건너뛰고 나머지는 체크포인트부터 이어서 수집")
+    argParser.add_argument("--excel-mode", choices=["rewrite", "partition"], default="partition", help="합친 결과를 엑셀에 저장하는 방식")
+    argParser.add_argument("--base-dir", default="C:\\jobdata", help="결과 파일 폴더")
+    args = argParser.parse_args()
+
+    if args.spec:
+        spec = load_spec(args.spec)
+    elif args.clo_date and args.reg_date:
+        spec = {"jobs": build_jobs(args)}
+    else:
+        argParser.error("--spec 또는 --clo-date/--reg-date 를 지정하세요.")
+
+    workers = args.workers or spec.get("workers") or os.cpu_count() or 1
+    fetchMode = args.fetch_mode or spec.get("fetchMode", "selenium")
+    jobs = spec["jobs"]
+
+    excelPath = os.path.join(args.base_dir, "jobData.xlsx")
+    excelEmailPath = os.path.join(args.base_dir, "jobDataEmail.xlsx")
+    streamPath = os.path.join(args.base_dir, "jobData.csv")
+    os.makedirs(os.path.join(args.base_dir, "batch"), exist_ok=True)
+
+    # 배치 번호, 시작 시각, 끝난 작업 (이어서 할 때 그대로 쓴다)
+    statePath = os.path.join(args.base_dir, "batch", "state.json")
+    state = load_state(statePath, args.resume)
+    save_state(statePath, state)
+
+    # 로그인은 한 번만 하고 모든 작업이 저장된 쿠키를 쓴다
+    if not args.skip_login:
+        subprocess.run(jobdata_command("--login-only"), check=True)
+
+    def run_job(job):
+        options = job_options(job, state, args.base_dir, fetchMode, args.resume)
+        print(f"작업 {job['name']} 시작")
+        returnCode = subprocess.run(jobdata_command(*options)).returncode
+        print(f"작업 {job['name']} {'완료' if returnCode == 0 else f'실패 (종료 코드 {returnCode})'}")
+        return returnCode
+
+    # 모든 작업이 seenIndex.db 를 함께 써서 겹치는 공고는 한 작업만 받는다
+    pending = [job for job in jobs if job["name"] not in state["done"]]
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, job): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            # 종료 코드가 0 이어도 저널이 done 으로 끝난 작업만 끝난 것으로 본다 (남은 페이지/공고는 --resume 으로)
+            if future.result() == 0 and journal_finished(job_paths(args.base_dir, job["name"])[1]):
+                state["done"].append(job["name"])
+                save_state(statePath, state)
+            else:
+                failed.append(job["name"])
+
+    if failed:
+        print(f"실패한 작업 {failed} - --resume 으로 다시 실행하면 이어서 수집합니다.")
+        sys.exit(1)
+
+    emailIndex = EmailIndex(os.path.join(args.base_dir, "seenIndex.db"))
+    newEmails = emailIndex.new_since(state["started"])
+    emailIndex.close()
+
+    outputPaths = [job_paths(args.base_dir, job["name"])[0] for job in jobs]
+    merged = merge_outputs(outputPaths, excelPath, excelEmailPath, streamPath, newEmails, args.excel_mode)
+    print(f"작업 {len(jobs)} 개의 결과 {merged} 건, 새 이메일 {len(newEmails)} 개를 합쳤습니다.")
+
+    # 합친 작업 결과는 정리
+    for job in jobs:
+        for path in job_paths(args.base_dir, job["name"]):
+            if os.path.exists(path):
+                os.remove(path)
+    os.remove(statePath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from jobdata_fixture import FixtureArchive, make_replay_server
+from jobdata_metrics import STAGES
+from jobdata_shard import jobdata_command
+
+# 프로세스 메모리/브라우저 수 측정 (없으면 해당 값은 비워 둔다)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+BROWSER_NAMES = ("chrome", "chromedriver")
+
+
+class ProcessWatcher:
+    """jobdata.py 프로세스와 자식 프로세스(브라우저)의 최대 RSS, 최대 브라우저 수 측정"""
+
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peakRss = None
+        self.peakBrowsers = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        if psutil is not None:
+            self.peakRss = 0
+            self.peakBrowsers = 0
+            self._thread.start()
+
+    def _sample(self, root):
+        processes = [root] + root.children(recursive=True)
+        rss = 0
+        browsers = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                if process.name().lower().startswith(BROWSER_NAMES):
+                    browsers += 1
+            except psutil.Error:
+                pass
+        self.peakRss = max(self.peakRss, rss)
+        self.peakBrowsers = max(self.peakBrowsers, browsers)
+
+    def _run(self):
+        try:
+            root = psutil.Process(self.pid)
+            while not self._stop.is_set():
+                self._sample(root)
+                self._stop.wait(self.interval)
+        except psutil.Error:
+            pass
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+def run_config(siteUrl, fetchMode, poolSize, batchSize, args):
+    """설정 하나로 jobdata.py 를 새 저장 폴더에서 실행하고 결과 한 줄을 돌려준다"""
+    with tempfile.TemporaryDirectory(prefix="jobdata-bench-") as dataDir:
+        timingPath = os.path.join(dataDir, "timings.json")
+        options = [
+            "--site", siteUrl,
+            "--skip-login",
+            "--fetch-mode", fetchMode,
+            "--pages", *args.pages,
+            "--clo-date", *args.clo_date,
+            "--reg-date", *args.reg_date,
+            "--data-dir", dataDir,
+            "--pool-size", str(poolSize),
+            "--concurrency", str(poolSize),
+            "--rate", str(args.rate),
+            "--batch-size", str(batchSize),
+            "--timings", timingPath,
+        ]
+
+        started = time.perf_counter()
+        worker = subprocess.Popen(jobdata_command(*options), stdout=subprocess.DEVNULL)
+        watcher = ProcessWatcher(worker.pid)
+        returnCode = worker.wait()
+        watcher.stop()
+        elapsed = time.perf_counter() - started
+
+        if returnCode != 0 or not os.path.exists(timingPath):
+            raise RuntimeError(f"jobdata.py 실행 실패 ({fetchMode}, pool {poolSize}, batch {batchSize}) : 종료 코드 {returnCode}")
+
+        with open(timingPath, encoding="utf-8") as timingFile:
+            timings = json.load(timingFile)
+
+    postings = timings["counters"]["postings"]
+    result = {
+        "mode": fetchMode,
+        "pool": poolSize,
+        "batch": batchSize,
+        "postings": postings,
+        "seconds": round(elapsed, 3),
+        "postings_per_s": round(postings / timings["elapsed"], 2) if timings["elapsed"] else None,
+    }
+    for stage in STAGES:
+        stageTiming = timings["stages"].get(stage, {})
+        for key in ("p50", "p95"):
+            value = stageTiming.get(key)
+            result[f"{stage}_{key}_ms"] = round(value * 1000, 1) if value is not None else None
+    result["peak_rss_mb"] = round(watcher.peakRss / 1024 / 1024, 1) if watcher.peakRss is not None else None
+    result["browsers"] = watcher.peakBrowsers
+    return result
+
+
+def print_table(results):
+    columns = ["mode", "pool", "batch", "postings", "postings_per_s", "detail_p50_ms", "detail_p95_ms",
+               "parse_p50_ms", "save_p95_ms", "peak_rss_mb", "browsers"]
+    print("  ".join(f"{column:>14}" for column in columns))
+    for result in results:
+        print("  ".join(f"{str(result[column]):>14}" for column in columns))
+
+
+def main():
+    argParser = argparse.ArgumentParser(description="녹화한 응답을 재생하며 jobdata.py 설정별 수집 속도 측정")
+    argParser.add_argument("archive", help="jobdata.py --record 로 만든 폴더")
+    argParser.add_argument("--pages", nargs=2, required=True, metavar=("START", "END"), help="녹화할 때와 같은 페이지 범위")
+    argParser.add_argument("--clo-date", nargs=2, required=True, metavar=("STDT", "ENDT"), help="녹화할 때와 같은 마감일 범위")
+    argParser.add_argument("--reg-date", nargs=2, required=True, metavar=("STDT", "ENDT"), help="녹화할 때와 같은 등록일 범위")
+    argParser.add_argument("--modes", nargs="+", choices=["selenium", "http"], default=["http", "selenium"])
+    argParser.add_argument("--pool-sizes", nargs="+", type=int, default=[1, 2, 4], help="드라이버 수 (selenium) / 동시 수집 수 (http)")
+    argParser.add_argument("--batch-sizes", nargs="+", type=int, default=[50], help="엑셀 저장 묶음 크기")
+    argParser.add_argument("--rate", type=float, default=1000.0, help="호스트별 초당 요청 수 (로컬 서버라 기본은 사실상 무제한)")
+    argParser.add_argument("--delay", type=float, default=0.0, help="재생 서버 응답 지연 초")
+    argParser.add_argument("--repeat", type=int, default=1, help="설정마다 반복 횟수")
+    argParser.add_argument("--output", help="결과를 덧붙일 CSV 경로 (변경 전/후 비교용)")
+    args = argParser.parse_args()
+
+    if psutil is None:
+        print("psutil 이 없어 메모리/브라우저 수는 측정하지 않습니다.")
+
+    # 재생 서버는 빈 포트에 띄워 모든 설정이 함께 쓴다
+    replayServer = make_replay_server(FixtureArchive(args.archive), port=0, delay=args.delay)
+    siteUrl = f"http://127.0.0.1:{replayServer.server_address[1]}"
+    threading.Thread(target=replayServer.serve_forever, daemon=True).start()
+
+    results = []
+    try:
+        for fetchMode, poolSize, batchSize in itertools.product(args.modes, args.pool_sizes, args.batch_sizes):
+            for _ in range(args.repeat):
+                result = run_config(siteUrl, fetchMode, poolSize, batchSize, args)
+                print(json.dumps(result, ensure_ascii=False))
+                results.append(result)
+    finally:
+        replayServer.shutdown()
+        replayServer.server_close()
+
+    print_table(results)
+
+    if args.output:
+        writeHeader = not os.path.exists(args.output)
+        with open(args.output, "a", newline="", encoding="utf-8") as outputFile:
+            writer = csv.DictWriter(outputFile, fieldnames=list(results[0]))
+            if writeHeader:
+                writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import json
+import os
+
+
+class CheckpointJournal:
+    """긴 수집을 이어서 하기 위한 체크포인트 저널.
+
+    JSON 한 줄에 이벤트 하나씩 덧붙이고 매번 fsync 한다.
+      start   : 실행 조건 (페이지 범위, 날짜 범위)
+      posting : 처리한 공고 (저장 대상이면 결과 행 포함)
+      saved   : sink 가 여기까지의 결과 행을 파일에 저장함
+      page    : 페이지의 모든 공고 처리 완료
+      done    : 실행 정상 종료
+    중간에 죽어서 마지막 줄이 잘려도 그 줄만 버리고 읽는다. 새로 만들거나
+    정리할 때는 임시 파일에 쓴 뒤 os.replace 로 바꿔치기한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.params = None
+        self.completedPages = set()
+        self.completedPostings = set()
+        self.acceptedRows = []
+        self._savedUpTo = {}
+        self._file = None
+
+    def _rewrite(self, events):
+        tmpPath = self.path + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as tmpFile:
+            for event in events:
+                tmpFile.write(json.dumps(event, ensure_ascii=False) + "\n")
+            tmpFile.flush()
+            os.fsync(tmpFile.fileno())
+        os.replace(tmpPath, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _write(self, event):
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _apply(self, event):
+        kind = event["event"]
+        if kind == "start":
+            self.params = event["params"]
+        elif kind == "posting":
+            self.completedPostings.add(event["wantedAuthNo"])
+            if event.get("row") is not None:
+                self.acceptedRows.append(event["row"])
+        elif kind == "saved":
+            self._savedUpTo[event["sink"]] = event["rows"]
+        elif kind == "page":
+            self.completedPages.add(event["page"])
+
+    def load(self):
+        """이어서 할 수 있는 저널이면 상태를 읽고 True, 없거나 정상 종료된 저널이면 False"""
+        if not os.path.exists(self.path):
+            return False
+
+        events = []
+        with open(self.path, encoding="utf-8") as journalFile:
+            for line in journalFile:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+
+        if not events or events[0]["event"] != "start" or events[-1]["event"] == "done":
+            return False
+
+        for event in events:
+            self._apply(event)
+        self._rewrite(events)
+        return True
+
+    def start(self, params):
+        self.params = params
+        self._rewrite([{"event": "start", "params": params}])
+
+    def posting(self, wantedAuthNo, row=None):
+        event = {"event": "posting", "wantedAuthNo": wantedAuthNo, "row": row}
+        self._write(event)
+        self._apply(event)
+
+    def saved(self, sink):
+        event = {"event": "saved", "sink": sink, "rows": len(self.acceptedRows)}
+        self._write(event)
+        self._apply(event)
+
+    def page_done(self, page):
+        event = {"event": "page", "page": page}
+        self._write(event)
+        self._apply(event)
+
+    def pending_rows(self, sink):
+        """sink 가 아직 파일에 저장하지 못한 결과 행"""
+        return self.acceptedRows[self._savedUpTo.get(sink, 0):]
+
+    def finish(self):
+        self._write({"event": "done"})
+        self.close()
+
+    def close(self):
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+
+def journal_finished(path):
+    """저널이 done 으로 끝났는지 (잘린 마지막 줄은 무시)"""
+    if not os.path.exists(path):
+        return False
+    lastEvent = None
+    with open(path, encoding="utf-8") as journalFile:
+        for line in journalFile:
+            try:
+                lastEvent = json.loads(line)
+            except json.JSONDecodeError:
+                break
+    return lastEvent is not None and lastEvent["event"] == "done"
@@ -0,0 +1,249 @@
+import json
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+
+
+# 드라이버 1개당 사용 횟수 / JS 힙 한도 기본값
+DEFAULT_MAX_USES = 50
+DEFAULT_MAX_HEAP_MB = 512
+
+# 린 프로필에서 받지 않을 리소스 (이미지, 글꼴, 스타일시트, 분석 스크립트)
+# 주소 뒤에 쿼리(?v=..)가 붙어도 막히도록 끝에도 * 를 둔다
+BLOCKED_URL_PATTERNS = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.svg*", "*.ico*", "*.webp*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*.css*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+]
+
+
+def lean_options(options):
+    """텍스트만 읽는 드라이버용 설정 - 이미지를 끄고 DOMContentLoaded 까지만 기다린다 (eager)"""
+    options.page_load_strategy = "eager"
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """CDP 로 문서 외 리소스 요청을 막는다 (드라이버를 띄운 직후 한 번)"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+# 설치된 크롬 브라우저 버전 (못 찾으면 None)
+def chrome_version():
+    if sys.platform == "win32":
+        import winreg
+
+        for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                pass
+        return None
+
+    for command in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser"):
+        try:
+            output = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        match = re.search(r"\d+(\.\d+)+", output)
+        if match:
+            return match.group()
+    return None
+
+
+class DriverResolver:
+    """chromedriver 경로를 브라우저 주 버전별로 캐시해 두고 재사용한다.
+
+    처음 path() 를 부를 때만 확인하며, 캐시에 현재 브라우저 버전의 드라이버가 있으면
+    네트워크 없이 바로 돌려준다. 없을 때만 webdriver_manager 로 받고, 그마저 실패하면
+    (오프라인) 캐시에 있는 가장 최근 버전의 드라이버를 쓴다.
+    """
+
+    def __init__(self, cachePath):
+        self.cachePath = cachePath
+        self._path = None
+        self._lock = threading.Lock()
+
+    def _load_cache(self):
+        try:
+            with open(self.cachePath, encoding="utf-8") as cacheFile:
+                return json.load(cacheFile)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        tmpPath = self.cachePath + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as cacheFile:
+            json.dump(cache, cacheFile, ensure_ascii=False, indent=2)
+        os.replace(tmpPath, self.cachePath)
+
+    def _resolve(self):
+        cache = self._load_cache()
+        version = chrome_version()
+        major = version.split(".")[0] if version else "unknown"
+
+        cached = cache.get(major)
+        if cached and os.path.exists(cached):
+            return cached
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            path = ChromeDriverManager().install()
+        except Exception:
+            # 네트워크가 없으면 캐시에 남은 드라이버 중 가장 최근 버전 사용
+            for key in sorted(cache, key=lambda key: int(key) if key.isdigit() else -1, reverse=True):
+                if os.path.exists(cache[key]):
+                    return cache[key]
+            raise
+
+        cache[major] = path
+        self._save_cache(cache)
+        return path
+
+    def path(self):
+        with self._lock:
+            if self._path is None:
+                self._path = self._resolve()
+            return self._path
+
+    def service(self):
+        # Service 는 chromedriver 프로세스 하나를 맡으므로 드라이버마다 새로 만든다
+        return Service(executable_path=self.path())
+
+
+class DriverPool:
+    """상세 페이지 크롤링용 headless Chrome 드라이버 풀.
+
+    드라이버는 acquire() 로 빌려 쓰고 반납 시 초기화된다.
+    maxUses 번 사용했거나 JS 힙이 maxHeapMB 를 넘으면 종료 후 새로 띄운다.
+    onCreate(driver) 는 새 드라이버를 띄울 때마다 호출된다 (리소스 차단 등).
+    """
+
+    def __init__(self, makeService, options, size=2, maxUses=DEFAULT_MAX_USES, maxHeapMB=DEFAULT_MAX_HEAP_MB, onCreate=None):
+        self.makeService = makeService
+        self.options = options
+        self.onCreate = onCreate
+        self.size = size
+        self.maxUses = maxUses
+        self.maxHeapMB = maxHeapMB
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._uses = {}
+        self._closed = False
+
+    def _new_driver(self):
+        driver = webdriver.Chrome(service=self.makeService(), options=self.options)
+        if self.onCreate is not None:
+            try:
+                self.onCreate(driver)
+            except Exception:
+                driver.quit()
+                raise
+        self._uses[id(driver)] = 0
+        return driver
+
+    def _take(self):
+        # size 개까지만 동시에 빌려주고, 놀고 있는 드라이버가 없으면 새로 띄운다
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            return self._new_driver()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _heap_mb(self, driver):
+        try:
+            used = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0")
+            return (used or 0) / (1024 * 1024)
+        except WebDriverException:
+            return 0
+
+    def _reset(self, driver):
+        # 추가로 열린 창 닫고 빈 페이지로 이동
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+
+    def _discard(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _release(self, driver, broken=False):
+        try:
+            self._recycle(driver, broken)
+        finally:
+            self._slots.release()
+
+    def _recycle(self, driver, broken):
+        if self._closed:
+            self._discard(driver)
+            return
+
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+
+        if not broken:
+            try:
+                if self._uses[id(driver)] >= self.maxUses or self._heap_mb(driver) >= self.maxHeapMB:
+                    broken = True
+                else:
+                    self._reset(driver)
+            except WebDriverException:
+                broken = True
+
+        # 재활용 대상은 종료하고 빈 자리는 다음 acquire 에서 새로 채운다
+        if broken:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def acquire(self):
+        driver = self._take()
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self._release(driver, broken)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,342 @@
+import asyncio
+import logging
+import math
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from jobdata_parser import parse_list_links, parse_total_count
+
+
+class TokenBucket:
+    """호스트별 요청 속도 제한 (초당 rate 개, 최대 burst 개까지 몰아서 허용)"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    async def take(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# 재시도 대기 시간 (full jitter: 0 ~ base * 2^attempt 사이에서 무작위, 최대 cap 초)
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """사이트가 요청을 거부하기 시작하면 잠시 모든 요청을 멈추는 차단기.
+
+    일시적 오류가 연속 failureThreshold 번 나면 열리고(open) resetSeconds 동안
+    요청을 보내지 않는다. 그 뒤 한 요청만 시험 삼아 보내 성공하면 닫히고,
+    실패하면 다시 열린다. 목록 스레드와 상세 수집 루프가 함께 쓴다.
+    """
+
+    def __init__(self, failureThreshold=5, resetSeconds=60):
+        self.failureThreshold = failureThreshold
+        self.resetSeconds = resetSeconds
+        self.failures = 0
+        self.openedAt = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def wait_seconds(self):
+        """지금 요청을 보내도 되면 0, 아니면 기다릴 초"""
+        with self._lock:
+            if self.openedAt is None:
+                return 0
+            remaining = self.openedAt + self.resetSeconds - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if self._probing:
+                # 시험 요청 결과를 기다린다
+                return 1.0
+            self._probing = True
+            return 0
+
+    def success(self):
+        with self._lock:
+            if self.openedAt is not None:
+                logging.info("차단기 닫힘 - 요청을 다시 보냅니다.")
+            self.failures = 0
+            self.openedAt = None
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self.openedAt is None and self.failures >= self.failureThreshold):
+                logging.warning(f"차단기 열림 - 연속 실패 {self.failures} 번, {self.resetSeconds} 초 동안 요청을 멈춥니다.")
+                self.openedAt = time.monotonic()
+                self._probing = False
+
+    def cancel_probe(self):
+        """성공/실패를 남기지 못하고 끝난 요청 - 시험 요청이었으면 다음 요청이 다시 시험하게 한다"""
+        with self._lock:
+            self._probing = False
+
+
+class AdaptiveLimiter:
+    """응답 시간과 오류를 보고 동시 요청 수를 조절한다 (AIMD).
+
+    latencyTarget 초 안에 성공한 응답이 현재 한도만큼 쌓이면 한도를 하나 늘리고,
+    느린 응답이나 일시적 오류가 나면 절반으로 줄인다 (1 ~ maxLimit).
+    이벤트 루프 스레드 안에서만 쓴다.
+    """
+
+    def __init__(self, maxLimit, latencyTarget=2.0):
+        self.maxLimit = maxLimit
+        self.limit = maxLimit
+        self.latencyTarget = latencyTarget
+        self.active = 0
+        self._successes = 0
+        self._condition = None
+
+    async def acquire(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self, latency, healthy):
+        async with self._condition:
+            self.active -= 1
+            if healthy and latency <= self.latencyTarget:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maxLimit:
+                    self.limit += 1
+                    self._successes = 0
+            else:
+                if self.limit > 1:
+                    self.limit = max(1, self.limit // 2)
+                    logging.info(f"동시 요청 수를 {self.limit} 개로 줄입니다. (응답 {latency:.1f} 초)")
+                self._successes = 0
+            self._condition.notify_all()
+
+
+# 일시적 오류면 jitter 를 둔 대기 후 다시 시도하는 동기 호출 (목록 페이지용)
+def call_with_retry(call, isTransient, retries=3, backoff=1.0, breaker=None, onRetry=None):
+    for attempt in range(retries + 1):
+        if breaker is not None:
+            waitSeconds = breaker.wait_seconds()
+            while waitSeconds > 0:
+                time.sleep(waitSeconds)
+                waitSeconds = breaker.wait_seconds()
+        settled = False
+        try:
+            result = call()
+        except Exception as e:
+            if not isTransient(e):
+                # 파싱 실패 같은 오류도 사이트는 응답한 것이므로 차단기에는 성공으로 센다
+                if breaker is not None:
+                    breaker.success()
+                    settled = True
+                raise
+            if breaker is not None:
+                breaker.failure()
+                settled = True
+            if attempt == retries:
+                raise
+            if onRetry is not None:
+                onRetry(e)
+        else:
+            if breaker is not None:
+                breaker.success()
+                settled = True
+            return result
+        finally:
+            if breaker is not None and not settled:
+                breaker.cancel_probe()
+        time.sleep(backoff_delay(attempt, backoff))
+
+
+class AsyncFetcher:
+    """상세 페이지 동시 수집기.
+
+    별도 스레드에서 asyncio 이벤트 루프를 돌리며, 동기 함수 fetch(url) 를
+    최대 concurrency 개까지 동시에 실행한다. 호스트별 토큰 버킷은 페이지가
+    바뀌어도 유지되므로 실행 전체에 걸쳐 같은 속도 제한이 적용된다.
+
+    isTransient(error) 가 참인 오류는 jitter 를 둔 대기 후 retries 번까지 다시 시도하고,
+    동시 실행 수는 AdaptiveLimiter 가 응답 시간/오류에 따라 줄이거나 늘린다.
+    breaker 가 열려 있는 동안은 새 요청을 보내지 않는다.
+    """
+
+    def __init__(self, fetch, concurrency=4, ratePerHost=2.0, burst=4, isTransient=None, retries=3, backoff=1.0,
+                 breaker=None, latencyTarget=2.0, onRetry=None):
+        self.fetch = fetch
+        self.concurrency = concurrency
+        self.ratePerHost = ratePerHost
+        self.burst = burst
+        self.isTransient = isTransient or (lambda error: False)
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.onRetry = onRetry
+        self.limiter = AdaptiveLimiter(concurrency, latencyTarget)
+
+        self._buckets = {}
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def _bucket(self, url):
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.ratePerHost, self.burst)
+        return self._buckets[host]
+
+    async def _fetch_one(self, url):
+        for attempt in range(self.retries + 1):
+            waitSeconds = self.breaker.wait_seconds()
+            while waitSeconds > 0:
+                await asyncio.sleep(waitSeconds)
+                waitSeconds = self.breaker.wait_seconds()
+
+            settled = False
+            try:
+                await self.limiter.acquire()
+            except BaseException:
+                self.breaker.cancel_probe()
+                raise
+            healthy = True
+            started = time.monotonic()
+            try:
+                await self._bucket(url).take()
+                started = time.monotonic()
+                result = await self._loop.run_in_executor(None, self.fetch, url)
+            except Exception as e:
+                # 파싱 실패 같은 오류는 사이트 상태와 무관하므로 바로 넘긴다 (사이트는 응답했으므로 차단기에는 성공)
+                if not self.isTransient(e):
+                    self.breaker.success()
+                    settled = True
+                    raise
+                healthy = False
+                self.breaker.failure()
+                settled = True
+                if attempt == self.retries:
+                    raise
+                error = e
+            else:
+                self.breaker.success()
+                settled = True
+                return result
+            finally:
+                # 취소 등으로 결과를 남기지 못한 시험 요청이 차단기를 붙잡아 두지 않게 한다
+                if not settled:
+                    self.breaker.cancel_probe()
+                await self.limiter.release(time.monotonic() - started, healthy)
+
+            logging.info(f"일시적 오류로 다시 시도합니다 ({attempt + 1}/{self.retries}) {url} : {error}")
+            if self.onRetry is not None:
+                self.onRetry(error)
+            await asyncio.sleep(backoff_delay(attempt, self.backoff))
+
+    def submit(self, urls):
+        """url 목록을 넣고 같은 순서의 concurrent.futures.Future 목록을 돌려준다"""
+        return [asyncio.run_coroutine_threadsafe(self._fetch_one(url), self._loop) for url in urls]
+
+    def close(self):
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ListPrefetcher:
+    """검색 목록 페이지를 미리 받아 두는 생산자 스레드.
+
+    fetchList(page) 로 받은 상세 링크 목록을 최대 depth 페이지까지 큐에 쌓아 두고,
+    꺼내는 쪽은 페이지 순서대로 (page, links, error) 를 받는다. 목록 드라이버는
+    이 스레드에서만 사용된다.
+    """
+
+    def __init__(self, fetchList, pages, depth=2):
+        self.fetchList = fetchList
+        self.pages = list(pages)
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        # 소비자가 멈췄으면 큐가 차 있어도 빠져나온다
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        for page in self.pages:
+            if self._stop.is_set():
+                return
+            try:
+                item = (page, self.fetchList(page), None)
+            except Exception as e:
+                item = (page, [], e)
+            if not self._put(item):
+                return
+        self._put(None)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            yield item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def plan_pages(fetchFirstPage, pageSizes):
+    """검색 결과 총 건수를 보고 서버가 받아 주는 가장 큰 페이지 크기와 페이지 수를 정한다.
+
+    fetchFirstPage(pageSize) 는 그 크기로 요청한 1 페이지 html 을 돌려준다.
+    큰 크기부터 시도해 목록 수가 기대한 만큼 오면 그 크기를 쓴다. 서버가 모든 후보보다
+    작게 잘라 보내면 가장 작은 크기로 요청하고 실제로 온 목록 수로 페이지 수를 센다.
+    (pageSize, pageCount, 1 페이지 html) 을 돌려주고, 총 건수를 못 읽으면 None.
+    """
+    for pageSize in sorted(pageSizes, reverse=True):
+        html = fetchFirstPage(pageSize)
+        total = parse_total_count(html)
+        if total is None:
+            return None
+        if total == 0:
+            return pageSize, 0, html
+
+        # 서버가 크기를 줄여서 보냈으면 더 작은 크기로 다시 시도
+        returned = len(parse_list_links(html, ""))
+        if returned >= min(pageSize, total):
+            return pageSize, math.ceil(total / pageSize), html
+
+    if returned == 0:
+        raise ValueError(f"검색 결과 {total} 건이 있는데 목록에서 공고 링크를 찾지 못했습니다.")
+    return pageSize, math.ceil(total / returned), html
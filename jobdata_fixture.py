@@ -0,0 +1,131 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from jobdata_store import now_text
+
+
+# 녹화한 html 안의 절대 주소를 재생 서버 주소로 바꿔 준다
+SITE_ROOTS = ("https://www.work24.go.kr", "https://www.work.go.kr")
+
+
+# 호스트와 파라미터 순서에 상관없이 같은 요청이면 같은 키
+def fixture_key(url):
+    parsed = urlparse(url)
+    return parsed.path + "?" + urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+
+
+class FixtureArchive:
+    """목록/상세 응답 녹화 보관소.
+
+    html 은 내용의 sha256 이름으로 blobs/ 에 gzip 으로 한 번만 저장하고,
+    요청 키 -> sha256 은 index.jsonl 에 한 줄씩 덧붙인다 (같은 키는 나중 줄이 우선).
+    여러 수집 스레드가 함께 record() 해도 된다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.blobDir = os.path.join(path, "blobs")
+        self.indexPath = os.path.join(path, "index.jsonl")
+        os.makedirs(self.blobDir, exist_ok=True)
+
+        self.index = {}
+        if os.path.exists(self.indexPath):
+            with open(self.indexPath, encoding="utf-8") as indexFile:
+                for line in indexFile:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self.index[entry["key"]] = entry["sha256"]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.index)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blobDir, digest + ".html.gz")
+
+    def record(self, url, html):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        key = fixture_key(url)
+
+        blobPath = self._blob_path(digest)
+        if not os.path.exists(blobPath):
+            tmpPath = f"{blobPath}.{threading.get_ident()}.tmp"
+            with open(tmpPath, "wb") as tmpFile:
+                tmpFile.write(gzip.compress(data))
+            os.replace(tmpPath, blobPath)
+
+        with self._lock:
+            if self.index.get(key) == digest:
+                return
+            self.index[key] = digest
+            with open(self.indexPath, "a", encoding="utf-8") as indexFile:
+                indexFile.write(json.dumps({"key": key, "sha256": digest, "recorded": now_text()}) + "\n")
+
+    def lookup(self, url):
+        digest = self.index.get(fixture_key(url))
+        if digest is None:
+            return None
+        with open(self._blob_path(digest), "rb") as blobFile:
+            return gzip.decompress(blobFile.read()).decode("utf-8")
+
+
+def make_replay_server(archive, host="127.0.0.1", port=8024, delay=0.0):
+    """보관소의 응답을 돌려주는 로컬 Work24 흉내 서버 (녹화에 없는 요청은 404)"""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            html = archive.lookup(self.path)
+            if html is None:
+                self.send_error(404, "Not recorded")
+                return
+
+            # 상세 링크가 실제 사이트로 나가지 않도록 주소를 바꾼다
+            siteRoot = f"http://{self.headers.get('Host', f'{host}:{port}')}"
+            for root in SITE_ROOTS:
+                html = html.replace(root, siteRoot)
+
+            if delay:
+                time.sleep(delay)
+
+            body = html.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="녹화한 Work24 응답을 로컬에서 재생")
+    argParser.add_argument("archive", help="jobdata.py --record 로 만든 폴더")
+    argParser.add_argument("--host", default="127.0.0.1")
+    argParser.add_argument("--port", type=int, default=8024)
+    argParser.add_argument("--delay", type=float, default=0.0, help="응답마다 기다릴 초 (실제 사이트 지연 흉내)")
+    args = argParser.parse_args()
+
+    fixtureArchive = FixtureArchive(args.archive)
+    replayServer = make_replay_server(fixtureArchive, args.host, args.port, args.delay)
+    print(f"응답 {len(fixtureArchive)} 개를 http://{args.host}:{args.port} 에서 재생합니다.")
+    try:
+        replayServer.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        replayServer.server_close()
@@ -0,0 +1,174 @@
+import os.path
+import pickle
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+
+# 로그인 페이지로 돌려보내졌는지 (세션 만료) 판단할 url 조각
+LOGIN_URL_MARKERS = ("openLginPage", "/login")
+
+
+# 다시 시도하면 나아질 수 있는 응답 (거부, 과부하, 서버 오류)
+RETRY_STATUS_CODES = {403, 429, 500, 502, 503, 504}
+
+
+class SessionExpired(Exception):
+    """로그인 세션이 만료되어 로그인 페이지로 이동됨"""
+
+
+class LoginRequired(Exception):
+    """세션이 만료됐는데 저장된 쿠키도 유효하지 않고 다시 로그인할 수도 없음 (수집을 멈춰야 함)"""
+
+
+def is_transient(error):
+    """연결 끊김, 시간 초과, 거부/과부하 응답처럼 잠시 뒤 다시 시도할 만한 오류인지"""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def is_login_url(url):
+    return any(marker in (url or "") for marker in LOGIN_URL_MARKERS)
+
+
+# selenium 으로 저장한 로그인 쿠키 불러오기
+def load_cookies(path):
+    with open(path, "rb") as cookieFile:
+        return pickle.load(cookieFile)
+
+
+def apply_cookies(cookieJar, cookies):
+    for cookie in cookies:
+        cookieJar.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+            secure=cookie.get("secure", False),
+            expires=cookie.get("expiry"),
+        )
+
+
+def make_session(cookies=None, poolSize=10):
+    """연결을 재사용하는 requests 세션 생성 (쿠키가 있으면 주입)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if cookies:
+        apply_cookies(session.cookies, cookies)
+    return session
+
+
+def fetch_html(session, url, timeout=10):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    if is_login_url(response.url):
+        raise SessionExpired(response.url)
+
+    # charset 헤더가 없으면 requests 가 ISO-8859-1 로 가정하므로 본문 기준으로 다시 판단
+    if response.encoding is None or response.encoding.lower() == "iso-8859-1":
+        response.encoding = response.apparent_encoding
+    return response.text
+
+
+class LoginSession:
+    """저장된 로그인 쿠키를 한 번만 읽어 두고 드라이버/HTTP 세션마다 한 번씩만 넣는다.
+
+    서버가 세션 만료(로그인 페이지로 이동)를 알리면 refresh() 로 쿠키 파일을 다시 읽고,
+    세대(generation)가 바뀐 드라이버/세션은 다음 사용 때 다시 쿠키를 넣는다.
+    checkUrl 을 주면 다시 읽은 쿠키가 유효한지 확인하고, 만료됐으면 relogin() 으로 다시
+    로그인한다. 그래도 안 되면 LoginRequired 를 내고 이후 refresh() 도 바로 LoginRequired.
+    """
+
+    def __init__(self, cookiePath, primeUrl, checkUrl=None, relogin=None):
+        self.cookiePath = cookiePath
+        self.primeUrl = primeUrl
+        self.checkUrl = checkUrl
+        self.relogin = relogin
+        self.expired = False
+        self.generation = 0
+        self.cookies = self._load()
+        self._primed = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # cookiePath 가 None 이면 (녹화 재생 등) 쿠키를 넣지 않는다
+        return load_cookies(self.cookiePath) if self.cookiePath and os.path.exists(self.cookiePath) else []
+
+    def prime_driver(self, driver):
+        if not self.cookies or self._primed.get(driver) == self.generation:
+            return
+
+        # 쿠키 도메인 페이지에 한 번 들어가야 add_cookie 가 가능하다
+        driver.get(self.primeUrl)
+        driver.delete_all_cookies()
+        for cookie in self.cookies:
+            driver.add_cookie(cookie)
+        self._primed[driver] = self.generation
+
+    def prime_session(self, session):
+        # 여러 수집 스레드가 같은 세션을 쓰므로, 진행 중인 요청의 쿠키 통을 비우지 않고
+        # 새 쿠키 통을 만들어 한 번에 바꿔 끼운다
+        with self._lock:
+            if self._primed.get(session) == self.generation:
+                return
+
+            cookieJar = requests.cookies.RequestsCookieJar()
+            apply_cookies(cookieJar, self.cookies)
+            session.cookies = cookieJar
+            self._primed[session] = self.generation
+
+    def refresh(self, seenGeneration):
+        """seenGeneration 에서 만료를 봤을 때 호출. 다른 스레드가 먼저 갱신했으면 다시 읽지 않는다"""
+        with self._lock:
+            if self.expired:
+                raise LoginRequired("로그인 세션이 만료되었습니다.")
+            if self.generation != seenGeneration:
+                return
+
+            cookies = self._load()
+            if self.checkUrl is not None and not cookies_valid(cookies, self.checkUrl):
+                if self.relogin is not None:
+                    self.relogin()
+                    cookies = self._load()
+                if not cookies_valid(cookies, self.checkUrl):
+                    self.expired = True
+                    raise LoginRequired("로그인 세션이 만료되었고 저장된 쿠키도 유효하지 않습니다.")
+
+            self.cookies = cookies
+            self.generation += 1
+
+
+def cookies_valid(cookies, checkUrl, timeout=10):
+    """저장된 쿠키로 로그인이 필요한 페이지에 접속해 보고, 로그인 페이지로 가지 않으면 유효"""
+    if not cookies:
+        return False
+
+    now = time.time()
+    liveCookies = [cookie for cookie in cookies if not cookie.get("expiry") or cookie["expiry"] > now]
+    if not liveCookies:
+        return False
+
+    session = make_session(liveCookies, poolSize=1)
+    try:
+        fetch_html(session, checkUrl, timeout=timeout)
+        return True
+    except (SessionExpired, requests.RequestException):
+        return False
+    finally:
+        session.close()
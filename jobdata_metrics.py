@@ -0,0 +1,143 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# 수집 단계 (로그인, 목록 받기, 상세 받기, 파싱, 필터, 저장, 엑셀 파일 쓰기)
+STAGES = ("login", "list", "detail", "parse", "filter", "save", "workbook")
+
+# 건수 (받은 공고, 중복, 고용허가제 공고, 목록에서 거른 공고, 오류, 재시도, 갱신 실행에서 바뀐/그대로인 공고)
+COUNTERS = ("postings", "duplicates", "permits", "skipped", "errors", "retries", "changed", "unchanged")
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Metrics:
+    """단계별 소요 시간과 건수 기록기.
+
+    상세 수집 스레드들이 함께 쓰므로 기록은 잠금 안에서 한다.
+    summary() 는 단계마다 횟수, 합계, p50/p95 (초) 와 건수를 돌려준다.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._durations = {stage: [] for stage in STAGES}
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def summary(self):
+        with self._lock:
+            durations = {stage: list(values) for stage, values in self._durations.items()}
+            counters = dict(self._counters)
+
+        return {
+            "elapsed": time.perf_counter() - self.started,
+            "stages": {
+                stage: {
+                    "count": len(values),
+                    "total": sum(values),
+                    "p50": percentile(values, 0.50),
+                    "p95": percentile(values, 0.95),
+                }
+                for stage, values in durations.items()
+            },
+            "counters": counters,
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as timingFile:
+            json.dump(self.summary(), timingFile, ensure_ascii=False, indent=2)
+
+    def json_line(self):
+        summary = self.summary()
+        line = {"elapsed": round(summary["elapsed"], 1), **summary["counters"]}
+        for stage, timing in summary["stages"].items():
+            if timing["count"]:
+                line[f"{stage}_p50_ms"] = round(timing["p50"] * 1000, 1)
+                line[f"{stage}_p95_ms"] = round(timing["p95"] * 1000, 1)
+        return json.dumps(line, ensure_ascii=False)
+
+    def prometheus_text(self):
+        summary = self.summary()
+        lines = ["# TYPE jobdata_stage_seconds summary"]
+        for stage, timing in summary["stages"].items():
+            for quantile, label in (("p50", "0.5"), ("p95", "0.95")):
+                if timing[quantile] is not None:
+                    lines.append(f'jobdata_stage_seconds{{stage="{stage}",quantile="{label}"}} {timing[quantile]}')
+            lines.append(f'jobdata_stage_seconds_sum{{stage="{stage}"}} {timing["total"]}')
+            lines.append(f'jobdata_stage_seconds_count{{stage="{stage}"}} {timing["count"]}')
+        for name, value in summary["counters"].items():
+            lines.append(f"# TYPE jobdata_{name}_total counter")
+            lines.append(f"jobdata_{name}_total {value}")
+        lines.append("# TYPE jobdata_elapsed_seconds gauge")
+        lines.append(f"jobdata_elapsed_seconds {summary['elapsed']}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsReporter:
+    """interval 초마다 지표 JSON 한 줄을 로그에 남기는 스레드 (close() 때 마지막 한 줄)"""
+
+    def __init__(self, metrics, interval=30):
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            logging.info(f"metrics {self.metrics.json_line()}")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        logging.info(f"metrics {self.metrics.json_line()}")
+
+
+def serve_prometheus(metrics, port, host="127.0.0.1"):
+    """/metrics 에 Prometheus 텍스트 형식으로 지표를 내보내는 서버를 백그라운드로 띄운다"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
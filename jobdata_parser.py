@@ -0,0 +1,192 @@
+import argparse
+import os.path
+import re
+import statistics
+import time
+from urllib.parse import urljoin
+
+import lxml.html
+
+
+# 엑셀 컬럼 순서대로의 상세 필드 (URL 공고 주소 제외)
+DETAIL_FIELDS = [
+    "업종", "직무내용", "모집인원", "근무지", "공고일자", "마감일자", "임금조건",
+    "담당자이름", "담당자전화번호", "담당자휴대폰", "담당자이메일",
+]
+
+# careers-table 의 th 텍스트 -> 상세 필드
+HEADER_FIELDS = {
+    "직무내용": "직무내용",
+    "모집인원": "모집인원",
+    "근무예정지": "근무지",
+    "임금조건": "임금조건",
+    "담당자": "담당자이름",
+    "전화번호": "담당자전화번호",
+    "휴대폰번호": "담당자휴대폰",
+    "이메일": "담당자이메일",
+    "채용공고 등록일시": "공고일자",
+    "접수마감일": "마감일자",
+    "고용허가제": "고용허가제",
+}
+
+
+def empty_detail():
+    detail = dict.fromkeys(DETAIL_FIELDS, "")
+    detail["고용허가제"] = ""
+    return detail
+
+
+# 브라우저의 .text 처럼 줄 단위로 공백 정리
+def element_text(element):
+    for br in element.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    lines = (" ".join(line.split()) for line in element.text_content().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+# 목록에서 공고 한 건을 감싸는 행 (표의 tr, 목록의 li, 없으면 링크의 부모)
+def _list_row(element):
+    for ancestor in element.iterancestors():
+        if ancestor.tag in ("tr", "li"):
+            return ancestor
+    parent = element.getparent()
+    return parent if parent is not None else element
+
+
+# 검색 목록 페이지에서 공고 상세 링크와 그 공고 행의 텍스트 추출
+def parse_list_items(html, baseUrl):
+    doc = lxml.html.fromstring(html)
+    items = []
+    for item in doc.find_class("link"):
+        for aTag in item.iter("a"):
+            href = aTag.get("href")
+            if href:
+                items.append((urljoin(baseUrl, href), " ".join(_list_row(item).text_content().split())))
+            break
+    return items
+
+
+# 검색 목록 페이지에서 공고 상세 링크 추출
+def parse_list_links(html, baseUrl):
+    return [link for link, _ in parse_list_items(html, baseUrl)]
+
+
+# 검색 결과 총 건수 ("총 1,234건")
+TOTAL_COUNT_PATTERN = re.compile(r"총\s*([\d,]+)\s*건")
+
+
+def parse_total_count(html):
+    doc = lxml.html.fromstring(html)
+    match = TOTAL_COUNT_PATTERN.search(" ".join(doc.text_content().split()))
+    return int(match.group(1).replace(",", "")) if match else None
+
+
+class ParseError(ValueError):
+    """상세 페이지 구조가 아닌 html (로그인 페이지, 오류 페이지 등)"""
+
+
+def has_class(element, name):
+    return name in (element.get("class") or "").split()
+
+
+# 업종: .right 안의 li 목록과 .info 안의 strong 목록이 같은 순서로 대응한다
+def _parse_info(right, detail):
+    infoItems = []
+    info = None
+    for element in right.iter():
+        if element.tag == "li":
+            infoItems.append(element)
+        elif info is None and has_class(element, "info"):
+            info = element
+
+    strongs = list(info.iter("strong")) if info is not None else []
+    for idx, strong in enumerate(strongs):
+        if idx < len(infoItems) and element_text(strong) == "업종":
+            div = next(infoItems[idx].iter("div"), None)
+            if div is not None:
+                detail["업종"] = element_text(div)
+
+
+# careers-table: th 순서와 같은 위치의 td 를 읽는다 (직무내용은 첫 td)
+def _parse_table(table, detail):
+    headers = []
+    cells = []
+    for element in table.iter("th", "td"):
+        (headers if element.tag == "th" else cells).append(element)
+
+    for idx, th in enumerate(headers):
+        field = HEADER_FIELDS.get(element_text(th))
+        if field is None or not cells:
+            continue
+        if field == "직무내용":
+            detail[field] = element_text(cells[0])
+        elif idx < len(cells):
+            detail[field] = element_text(cells[idx])
+
+
+# 공고 상세 페이지 html 에서 필드 추출
+# 문서를 한 번 훑으면서 첫 .right 와 careers-table 들을 찾고, 각 영역은 한 번씩만 읽는다
+def parse_detail(html):
+    doc = lxml.html.fromstring(html)
+    detail = empty_detail()
+
+    right = None
+    tables = []
+    for element in doc.iter():
+        if not isinstance(element.tag, str) or "class" not in element.attrib:
+            continue
+        if right is None and has_class(element, "right"):
+            right = element
+        elif has_class(element, "careers-table"):
+            tables.append(element)
+
+    if not tables:
+        raise ParseError("careers-table 을 찾을 수 없습니다.")
+
+    if right is not None:
+        _parse_info(right, detail)
+    for table in tables:
+        _parse_table(table, detail)
+
+    return detail
+
+
+# 저장해 둔 상세 페이지로 파서 속도 측정
+# python jobdata_parser.py <html 파일 또는 폴더> [--repeat N]
+def bench(paths, repeat=100):
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            pages += [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".html")]
+        else:
+            pages.append(path)
+
+    htmls = []
+    for page in pages:
+        with open(page, encoding="utf-8") as pageFile:
+            htmls.append(pageFile.read())
+
+    if not htmls:
+        print("측정할 html 파일이 없습니다.")
+        return
+
+    timings = []
+    for html in htmls:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parse_detail(html)
+        timings.append((time.perf_counter() - start) / repeat)
+
+    timings.sort()
+    print(f"페이지 {len(htmls)} 개, 페이지당 {repeat} 회")
+    print(f"평균 {statistics.mean(timings) * 1000:.3f} ms, 중앙값 {statistics.median(timings) * 1000:.3f} ms, "
+          f"최대 {timings[-1] * 1000:.3f} ms")
+    print(f"초당 {1 / statistics.mean(timings):.0f} 페이지")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="상세 페이지 파서 마이크로벤치마크")
+    parser.add_argument("paths", nargs="+", help="저장한 상세 페이지 html 파일 또는 폴더")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    bench(args.paths, args.repeat)
@@ -0,0 +1,157 @@
+import argparse
+import csv
+import os
+import subprocess
+import sys
+
+from jobdata_sink import EMAIL_COLUMNS, RESULT_COLUMNS, ExcelSink, open_stream_sink
+from jobdata_store import EmailIndex, now_text
+
+
+JOBDATA_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobdata.py")
+
+
+# 시작~종료 페이지를 연속된 구간 workers 개로 나누기
+def split_pages(startPage, endPage, workers):
+    pages = list(range(startPage, endPage))
+    size, extra = divmod(len(pages), workers)
+    shards = []
+    start = 0
+    for idx in range(workers):
+        count = size + (1 if idx < extra else 0)
+        if count:
+            shards.append((pages[start], pages[start + count - 1] + 1))
+        start += count
+    return shards
+
+
+def shard_paths(baseDir, idx):
+    shardDir = os.path.join(baseDir, "shards")
+    return os.path.join(shardDir, f"shard-{idx}.csv"), os.path.join(shardDir, f"checkpoint-{idx}.jsonl")
+
+
+def jobdata_command(*options):
+    # pyinstaller 로 묶은 jobdata.exe 에서 실행하면 실행 파일 자신에게 옵션만 넘긴다
+    if getattr(sys, "frozen", False):
+        return [sys.executable, *options]
+    return [sys.executable, JOBDATA_SCRIPT, *options]
+
+
+# 결과 CSV 들을 주어진 순서(파일 순서 -> 파일 안의 순서)대로 합쳐 엑셀/스트림에 붙이기
+# 이메일 엑셀에는 작업들이 이메일 인덱스에 처음 넣은 주소(newEmails)만 붙인다
+def merge_outputs(outputPaths, excelPath, excelEmailPath, streamPath, newEmails, excelMode="partition"):
+    urlIndex = len(RESULT_COLUMNS) - 1
+
+    rows = []
+    seenUrls = set()
+    for outputPath in outputPaths:
+        if not os.path.exists(outputPath):
+            continue
+        with open(outputPath, newline="", encoding="utf-8") as shardFile:
+            reader = csv.reader(shardFile)
+            next(reader, None)
+            for row in reader:
+                if row[urlIndex] not in seenUrls:
+                    seenUrls.add(row[urlIndex])
+                    rows.append(row)
+
+    resultSink = ExcelSink(excelPath, RESULT_COLUMNS, batchSize=len(rows) + 1, flushSeconds=float("inf"), mode=excelMode)
+    emailSink = ExcelSink(excelEmailPath, EMAIL_COLUMNS, batchSize=len(newEmails) + 1, flushSeconds=float("inf"), mode=excelMode)
+    streamSink = open_stream_sink(streamPath, RESULT_COLUMNS, "csv") if streamPath else None
+    for row in rows:
+        resultSink.append(row)
+        if streamSink is not None:
+            streamSink.append(row)
+    for email in newEmails:
+        emailSink.append([email])
+    resultSink.close()
+    emailSink.close()
+    if streamSink is not None:
+        streamSink.close()
+
+    return len(rows)
+
+
+# 샤드 결과를 페이지 순서(샤드 순서 -> 샤드 안의 순서)대로 합치기
+def merge_shards(shards, baseDir, excelPath, excelEmailPath, streamPath, newEmails, excelMode="partition"):
+    outputPaths = [shard_paths(baseDir, idx)[0] for idx in range(len(shards))]
+    return merge_outputs(outputPaths, excelPath, excelEmailPath, streamPath, newEmails, excelMode)
+
+
+def main():
+    argParser = argparse.ArgumentParser(description="jobdata.py 페이지 범위를 나눠 여러 프로세스로 수집")
+    argParser.add_argument("--pages", nargs=2, type=int, required=True, metavar=("START", "END"), help="검색 시작/종료 페이지")
+    argParser.add_argument("--clo-date", nargs=2, required=True, metavar=("STDT", "ENDT"), help="공고 마감 시작/종료일")
+    argParser.add_argument("--reg-date", nargs=2, required=True, metavar=("STDT", "ENDT"), help="공고 등록 시작/종료일")
+    argParser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="동시에 돌릴 프로세스 수")
+    argParser.add_argument("--fetch-mode", choices=["selenium", "http"], default="selenium")
+    argParser.add_argument("--skip-login", action="store_true", help="로그인 창 없이 저장된 쿠키 사용")
+    argParser.add_argument("--resume", action="store_true", help="각 샤드를 체크포인트부터 이어서 수집")
+    argParser.add_argument("--excel-mode", choices=["rewrite", "partition"], default="partition", help="합친 결과를 엑셀에 저장하는 방식")
+    argParser.add_argument("--base-dir", default="C:\\jobdata", help="결과 파일 폴더")
+    args = argParser.parse_args()
+
+    excelPath = os.path.join(args.base_dir, "jobData.xlsx")
+    excelEmailPath = os.path.join(args.base_dir, "jobDataEmail.xlsx")
+    streamPath = os.path.join(args.base_dir, "jobData.csv")
+    os.makedirs(os.path.join(args.base_dir, "shards"), exist_ok=True)
+
+    # 이번 수집(이어서 하면 처음 시작한 때)부터 처음 나온 이메일만 합치기 위한 시작 시각
+    startedPath = os.path.join(args.base_dir, "shards", "started.txt")
+    if args.resume and os.path.exists(startedPath):
+        with open(startedPath, encoding="utf-8") as startedFile:
+            runStarted = startedFile.read().strip()
+    else:
+        runStarted = now_text()
+        with open(startedPath, "w", encoding="utf-8") as startedFile:
+            startedFile.write(runStarted)
+
+    # 로그인은 한 번만 하고 모든 샤드가 저장된 쿠키를 쓴다
+    if not args.skip_login:
+        subprocess.run(jobdata_command("--login-only"), check=True)
+
+    shards = split_pages(args.pages[0], args.pages[1], args.workers)
+    workers = []
+    for idx, (startPage, endPage) in enumerate(shards):
+        shardOutput, shardCheckpoint = shard_paths(args.base_dir, idx)
+        options = [
+            "--pages", str(startPage), str(endPage),
+            "--clo-date", *args.clo_date,
+            "--reg-date", *args.reg_date,
+            "--fetch-mode", args.fetch_mode,
+            "--skip-login",
+            "--data-dir", args.base_dir,
+            "--shard-output", shardOutput,
+            "--checkpoint", shardCheckpoint,
+        ]
+        if args.resume:
+            options.append("--resume")
+        elif os.path.exists(shardOutput):
+            # 새로 시작하는 샤드는 지난 결과를 비운다
+            os.remove(shardOutput)
+
+        print(f"샤드 {idx} : 페이지 {startPage} ~ {endPage - 1}")
+        workers.append(subprocess.Popen(jobdata_command(*options)))
+
+    failed = [idx for idx, worker in enumerate(workers) if worker.wait() != 0]
+    if failed:
+        print(f"실패한 샤드 {failed} - --resume 으로 다시 실행하면 이어서 수집합니다.")
+        sys.exit(1)
+
+    emailIndex = EmailIndex(os.path.join(args.base_dir, "seenIndex.db"))
+    newEmails = emailIndex.new_since(runStarted)
+    emailIndex.close()
+
+    merged = merge_shards(shards, args.base_dir, excelPath, excelEmailPath, streamPath, newEmails, args.excel_mode)
+    print(f"샤드 {len(shards)} 개의 결과 {merged} 건, 새 이메일 {len(newEmails)} 개를 합쳤습니다.")
+
+    # 합친 샤드 결과는 정리
+    for idx in range(len(shards)):
+        for path in shard_paths(args.base_dir, idx):
+            if os.path.exists(path):
+                os.remove(path)
+    os.remove(startedPath)
+
+
+if __name__ == "__main__":
+    main()
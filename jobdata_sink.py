@@ -0,0 +1,373 @@
+import argparse
+import csv
+import json
+import os.path
+import time
+from datetime import datetime
+
+import openpyxl
+
+# 파트 pending 파일 잠금 (실행 중인 다른 프로세스의 pending 파일은 복구하지 않기 위해)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+# 결과 엑셀 컬럼 (제목, 너비)
+RESULT_COLUMNS = [
+    ("업종", 20), ("직무내용", 50), ("모집인원", 20), ("근무지역", 20), ("공고일자", 50), ("마감일자", 50),
+    ("임금조건", 50), ("담당자 이름", 20), ("담당자 전화번호", 20), ("담당자 휴대폰 번호", 20),
+    ("수신자 Email 주소", 20), ("URL 공고 주소", 200),
+]
+EMAIL_COLUMNS = [("수신자 Email 주소", 50)]
+
+
+# 잠금 파일을 열어 다른 프로세스가 잡고 있지 않으면 잠그고 돌려준다 (잡혀 있으면 None)
+def lock_file(lockPath):
+    lockFile = open(lockPath, "a")
+    try:
+        if fcntl is not None:
+            fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lockFile.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lockFile.close()
+        return None
+    return lockFile
+
+
+def partition_dir(path):
+    """파티션 저장 폴더 (C:\\jobdata\\jobData.xlsx -> C:\\jobdata\\jobData_parts)"""
+    return os.path.splitext(path)[0] + "_parts"
+
+
+def prepare_sheet(sheet, columns):
+    sheet.print_options.horizontalCentered = True
+    sheet.print_options.verticalCentered = True
+    for idx, (title, width) in enumerate(columns, start=1):
+        letter = openpyxl.utils.get_column_letter(idx)
+        sheet.column_dimensions[letter].width = width
+        sheet[f"{letter}1"] = title
+
+
+class ExcelSink:
+    """엑셀 결과 파일에 행을 모아서 저장한다.
+
+    append() 한 행은 버퍼에 쌓였다가 batchSize 개가 되거나 flushSeconds 초가
+    지나면 한 번에 flush 된다. onFlush 는 버퍼가 파일에 기록된 뒤 호출되며,
+    그때 lastSaveSeconds 에 이번 기록에 걸린 초가 들어 있다.
+
+    mode="rewrite" : flush 마다 워크북에 붙여 전체를 저장 (기존 방식을 묶음 단위로)
+    mode="append"  : flush 때는 옆의 .pending.csv 에 덧붙이기만 하고, 워크북은 close()
+                     에서 한 번만 불러와 저장한다. 중간에 죽으면 다음 실행 시 pending
+                     파일이 워크북으로 옮겨진다.
+    mode="partition" : 지난 기록을 불러오지 않는다. 실행마다 파티션 폴더에 파트 워크북을
+                     하나씩 만들고 (실행 중엔 append 처럼 pending 파일에 덧붙임) close() 에서
+                     write-only 로 한 번에 쓴 뒤 index.jsonl 에 기록한다. 기록이 아무리 쌓여도
+                     시작 시간과 메모리가 늘지 않는다. 실행 중에는 pending 파일 옆의 .lock
+                     파일을 잠가 두어, 같은 폴더를 쓰는 다른 실행이 복구하지 않게 한다.
+    """
+
+    def __init__(self, path, columns, batchSize=50, flushSeconds=60, mode="rewrite", onFlush=None):
+        if mode not in ("rewrite", "append", "partition"):
+            raise ValueError(f"알 수 없는 저장 방식입니다: {mode}")
+
+        self.path = path
+        self.columns = columns
+        self.batchSize = batchSize
+        self.flushSeconds = flushSeconds
+        self.mode = mode
+        self.onFlush = onFlush
+        self.pendingPath = os.path.splitext(path)[0] + ".pending.csv"
+
+        self._buffer = []
+        self._lastFlush = time.monotonic()
+        self.lastSaveSeconds = 0.0
+        self._workbook = None
+        self._lockFile = None
+        self._closed = False
+
+        if mode == "partition":
+            self.partDir = partition_dir(path)
+            os.makedirs(self.partDir, exist_ok=True)
+
+            # 끝난(죽은) 실행이 파트로 만들지 못한 행 복구 - 잠금을 잡을 수 있는 pending 파일만
+            for name in sorted(os.listdir(self.partDir)):
+                if name.endswith(".pending.csv"):
+                    pendingPath = os.path.join(self.partDir, name)
+                    lockPath = pendingPath[:-len(".pending.csv")] + ".lock"
+                    lockFile = lock_file(lockPath)
+                    if lockFile is None:
+                        continue
+                    self._write_part(pendingPath)
+                    lockFile.close()
+                    os.remove(lockPath)
+
+            # 파트 이름은 실행 시각 + 프로세스 번호 (같은 초에 또 열면 번호를 붙인다)
+            # 잠금 파일을 먼저 만들어 잠근 뒤에 pending 파일을 쓴다
+            stem = os.path.splitext(os.path.basename(path))[0]
+            partName = f"{stem}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+            suffix = 0
+            while True:
+                partBase = os.path.join(self.partDir, partName + (f"-{suffix}" if suffix else ""))
+                suffix += 1
+                if any(os.path.exists(partBase + ext) for ext in (".xlsx", ".pending.csv", ".lock")):
+                    continue
+                self._lockFile = lock_file(partBase + ".lock")
+                if self._lockFile is not None:
+                    break
+            self.pendingPath = partBase + ".pending.csv"
+            return
+
+        # 이전 실행이 저장하지 못한 행 복구
+        if os.path.exists(self.pendingPath):
+            self._merge_pending()
+
+        if mode == "rewrite":
+            self._open_workbook()
+
+    def _open_workbook(self):
+        if self._workbook is None:
+            if os.path.exists(self.path):
+                self._workbook = openpyxl.load_workbook(self.path)
+            else:
+                self._workbook = openpyxl.Workbook()
+            prepare_sheet(self._workbook.active, self.columns)
+        return self._workbook
+
+    def _merge_pending(self):
+        workbook = self._open_workbook()
+        with open(self.pendingPath, newline="", encoding="utf-8") as pendingFile:
+            for row in csv.reader(pendingFile):
+                workbook.active.append(row)
+        workbook.save(self.path)
+        os.remove(self.pendingPath)
+
+    def _write_part(self, pendingPath):
+        # pending 파일 하나를 write-only 파트 워크북으로 만들고 색인에 추가
+        partPath = pendingPath[:-len(".pending.csv")] + ".xlsx"
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        for idx, (_, width) in enumerate(self.columns, start=1):
+            sheet.column_dimensions[openpyxl.utils.get_column_letter(idx)].width = width
+        sheet.append([title for title, _ in self.columns])
+
+        rowCount = 0
+        with open(pendingPath, newline="", encoding="utf-8") as pendingFile:
+            for row in csv.reader(pendingFile):
+                sheet.append(row)
+                rowCount += 1
+
+        tmpPath = partPath + ".tmp"
+        workbook.save(tmpPath)
+        os.replace(tmpPath, partPath)
+        with open(os.path.join(self.partDir, "index.jsonl"), "a", encoding="utf-8") as indexFile:
+            indexFile.write(json.dumps({
+                "part": os.path.basename(partPath),
+                "rows": rowCount,
+                "created": datetime.now().isoformat(timespec="seconds"),
+            }, ensure_ascii=False) + "\n")
+        os.remove(pendingPath)
+
+    def append(self, row):
+        self._buffer.append(list(row))
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        if len(self._buffer) >= self.batchSize or time.monotonic() - self._lastFlush >= self.flushSeconds:
+            self.flush()
+
+    def flush(self):
+        self._lastFlush = time.monotonic()
+        if not self._buffer:
+            return
+
+        started = time.perf_counter()
+        if self.mode in ("append", "partition"):
+            with open(self.pendingPath, "a", newline="", encoding="utf-8") as pendingFile:
+                csv.writer(pendingFile).writerows(self._buffer)
+        else:
+            sheet = self._open_workbook().active
+            for row in self._buffer:
+                sheet.append(row)
+            self._workbook.save(self.path)
+        self.lastSaveSeconds = time.perf_counter() - started
+
+        self._buffer = []
+        if self.onFlush is not None:
+            self.onFlush()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+
+        self.flush()
+        if self.mode == "append" and os.path.exists(self.pendingPath):
+            self._merge_pending()
+        elif self.mode == "partition" and os.path.exists(self.pendingPath):
+            self._write_part(self.pendingPath)
+        if self._lockFile is not None:
+            self._lockFile.close()
+            os.remove(self.pendingPath[:-len(".pending.csv")] + ".lock")
+        self._workbook = None
+
+
+class CsvSink:
+    """결과 행을 CSV 파일 끝에 한 줄씩 덧붙이는 sink (기존 내용은 다시 쓰지 않음)"""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.titles = [title for title, _ in columns]
+
+        newFile = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if newFile:
+            self._writer.writerow(self.titles)
+            self._file.flush()
+
+    def append(self, row):
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def sync(self):
+        # 저널에 저장 완료로 남기기 전에 디스크까지 내려보낸다
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class JsonlSink:
+    """결과 행을 컬럼 제목을 키로 하는 JSON 한 줄씩 덧붙이는 sink"""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.titles = [title for title, _ in columns]
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, row):
+        self._file.write(json.dumps(dict(zip(self.titles, row)), ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ParquetSink:
+    """결과 행을 rowGroupSize 개씩 묶어 Parquet row group 으로 쓰는 sink.
+
+    Parquet 파일은 닫은 뒤 이어 쓸 수 없으므로, 같은 이름의 파일이 이미 있으면
+    실행 시각을 붙인 새 파일에 쓴다. pyarrow 가 필요하다.
+    """
+
+    def __init__(self, path, columns, rowGroupSize=1000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("parquet 저장에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+
+        if os.path.exists(path):
+            stem, ext = os.path.splitext(path)
+            path = f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}{ext}"
+
+        self.path = path
+        self.titles = [title for title, _ in columns]
+        self.rowGroupSize = rowGroupSize
+
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([(title, pyarrow.string()) for title in self.titles])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._buffer = []
+
+    def append(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.rowGroupSize:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        columns = [[str(row[idx]) for row in self._buffer] for idx in range(len(self.titles))]
+        self._writer.write_table(self._pa.Table.from_arrays(columns, schema=self._schema))
+        self._buffer = []
+
+    def sync(self):
+        # 모아 둔 행을 row group 으로 쓴다 (Parquet 은 닫기 전에는 파일 끝 정보가 없다)
+        self.flush()
+
+    def close(self):
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+def open_stream_sink(path, columns, streamFormat):
+    if streamFormat == "csv":
+        return CsvSink(path, columns)
+    if streamFormat == "jsonl":
+        return JsonlSink(path, columns)
+    if streamFormat == "parquet":
+        return ParquetSink(path, columns)
+    raise ValueError(f"알 수 없는 스트림 형식입니다: {streamFormat}")
+
+
+# 스트림에 쌓인 이번 실행의 행으로 엑셀 파일 만들기 (저장은 한 번)
+def export_excel(rows, path, columns, batchSize=None, mode="rewrite"):
+    excelSink = ExcelSink(path, columns, batchSize=batchSize or len(rows) + 1, flushSeconds=float("inf"), mode=mode)
+    for row in rows:
+        excelSink.append(row)
+    excelSink.close()
+
+
+# 파티션 폴더의 파트들을 만든 순서대로 읽기 (read-only 로 한 파트씩)
+def partition_rows(path):
+    partDir = partition_dir(path)
+    indexPath = os.path.join(partDir, "index.jsonl")
+    if not os.path.exists(indexPath):
+        return
+
+    with open(indexPath, encoding="utf-8") as indexFile:
+        parts = [json.loads(line)["part"] for line in indexFile if line.strip()]
+
+    for part in parts:
+        workbook = openpyxl.load_workbook(os.path.join(partDir, part), read_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        next(rows, None)
+        for row in rows:
+            yield ["" if value is None else value for value in row]
+        workbook.close()
+
+
+# 파트들을 한 워크북으로 합치기 (필요할 때만)
+# python jobdata_sink.py C:\jobdata\jobData.xlsx C:\jobdata\jobDataAll.xlsx
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="파티션으로 저장한 결과 파트들을 한 엑셀 파일로 합치기")
+    argParser.add_argument("path", help="jobdata.py 의 excelPath (jobData.xlsx / jobDataEmail.xlsx)")
+    argParser.add_argument("output", help="합친 엑셀 파일 경로")
+    argParser.add_argument("--email", action="store_true", help="이메일 결과(jobDataEmail.xlsx) 파트 합치기")
+    args = argParser.parse_args()
+
+    columns = EMAIL_COLUMNS if args.email else RESULT_COLUMNS
+    combined = openpyxl.Workbook(write_only=True)
+    combinedSheet = combined.create_sheet()
+    combinedSheet.append([title for title, _ in columns])
+    rowCount = 0
+    for row in partition_rows(args.path):
+        combinedSheet.append(row)
+        rowCount += 1
+    combined.save(args.output)
+    print(f"{rowCount} 행을 {args.output} 에 합쳤습니다.")
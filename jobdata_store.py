@@ -0,0 +1,264 @@
+import argparse
+import csv
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def now_text():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# 공고 내용(상세 필드 값들) 해시 - 다시 받았을 때 바뀌었는지 비교용
+def content_hash(values):
+    return hashlib.sha256("\x1f".join(values).encode("utf-8")).hexdigest()
+
+
+class SeenIndex:
+    """이미 처리한 공고(wantedAuthNo) 인덱스.
+
+    sqlite 테이블에 처음 본 시각과 함께 저장하고, 실행 시 한 번만 메모리 set 으로
+    읽어 중복 확인은 O(1) 로 한다. 여러 샤드 프로세스가 같은 파일을 함께 쓰므로
+    기록은 바로 커밋하고, add() 는 DB 에 실제로 새로 들어갔을 때만 True 를 돌려준다.
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "wantedAuthNo TEXT PRIMARY KEY, "
+            "firstSeen TEXT NOT NULL)"
+        )
+        # 실행 간에 이어지는 값 (증분 수집 기준 공고 등)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # 배치 작업끼리 같은 공고를 두 번 받지 않도록 상세 수집 전에 잡아 두는 표시
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS claims ("
+            "wantedAuthNo TEXT PRIMARY KEY, "
+            "batchId TEXT NOT NULL, "
+            "owner TEXT NOT NULL)"
+        )
+        # 파싱한 공고의 내용 해시와 마감일 (갱신 실행에서 마감 전 공고만 다시 받아 비교)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "wantedAuthNo TEXT PRIMARY KEY, "
+            "url TEXT NOT NULL, "
+            "cloDate TEXT NOT NULL, "
+            "contentHash TEXT NOT NULL, "
+            "checked TEXT NOT NULL, "
+            "changed TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS postings_cloDate ON postings (cloDate)")
+        self._seen = {row[0] for row in self.conn.execute("SELECT wantedAuthNo FROM seen")}
+
+    def __contains__(self, wantedAuthNo):
+        return wantedAuthNo in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+    def add(self, wantedAuthNo):
+        if wantedAuthNo in self._seen:
+            return False
+
+        self._seen.add(wantedAuthNo)
+        cursor = self.conn.execute("INSERT OR IGNORE INTO seen VALUES (?, ?)", (wantedAuthNo, now_text()))
+        return cursor.rowcount == 1
+
+    @contextmanager
+    def reserve(self, wantedAuthNo):
+        """add() 처럼 새 공고인지(True) 넘겨주되, DB 커밋은 with 블록이 끝난 뒤에 한다.
+
+        블록 안에서 체크포인트 저널에 먼저 남기면, 그 사이에 죽어도 처리 인덱스에만
+        남고 결과 행은 잃어버리는 일이 없다. 블록 안에서는 같은 DB 를 쓰는 다른 연결
+        (EmailIndex 등)을 쓰지 않는다.
+        """
+        if wantedAuthNo in self._seen:
+            yield False
+            return
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.conn.execute("INSERT OR IGNORE INTO seen VALUES (?, ?)", (wantedAuthNo, now_text()))
+            isNew = cursor.rowcount == 1
+            yield isNew
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        self._seen.add(wantedAuthNo)
+
+    def claim(self, wantedAuthNo, batchId, owner):
+        """같은 배치의 다른 작업이 먼저 잡지 않았으면 owner 가 잡고 True.
+
+        다른(지난) 배치의 표시나 owner 자신의 표시(중간에 죽은 뒤 --resume)는 넘겨받는다.
+        """
+        row = self.conn.execute("SELECT batchId, owner FROM claims WHERE wantedAuthNo = ?", (wantedAuthNo,)).fetchone()
+        if row is None:
+            cursor = self.conn.execute("INSERT OR IGNORE INTO claims VALUES (?, ?, ?)", (wantedAuthNo, batchId, owner))
+            return cursor.rowcount == 1
+        if row[0] == batchId and row[1] != owner:
+            return False
+
+        # 동시에 넘겨받으려 하면 먼저 바꾼 쪽만 성공한다
+        cursor = self.conn.execute(
+            "UPDATE claims SET batchId = ?, owner = ? WHERE wantedAuthNo = ? AND batchId = ? AND owner = ?",
+            (batchId, owner, wantedAuthNo, row[0], row[1]),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, wantedAuthNo, batchId, owner):
+        """수집에 실패한 공고의 표시를 풀어 다른 작업/다음 실행이 받을 수 있게 한다"""
+        self.conn.execute("DELETE FROM claims WHERE wantedAuthNo = ? AND batchId = ? AND owner = ?", (wantedAuthNo, batchId, owner))
+
+    def record_content(self, wantedAuthNo, url, cloDate, contentHash):
+        """공고 내용 해시를 남기고, 처음 보거나 내용이 바뀌었으면 True (cloDate 는 YYYYMMDD, 없으면 "")"""
+        now = now_text()
+        row = self.conn.execute("SELECT contentHash FROM postings WHERE wantedAuthNo = ?", (wantedAuthNo,)).fetchone()
+        if row is not None and row[0] == contentHash:
+            self.conn.execute("UPDATE postings SET url = ?, cloDate = ?, checked = ? WHERE wantedAuthNo = ?", (url, cloDate, now, wantedAuthNo))
+            return False
+
+        self.conn.execute("INSERT OR REPLACE INTO postings VALUES (?, ?, ?, ?, ?, ?)", (wantedAuthNo, url, cloDate, contentHash, now, now))
+        return True
+
+    @contextmanager
+    def recording_content(self, wantedAuthNo, url, cloDate, contentHash):
+        """record_content() 처럼 바뀌었는지(True) 넘겨주되, DB 커밋은 with 블록이 끝난 뒤에 한다.
+
+        갱신 실행에서 바뀐 행을 저널에 먼저 남기기 위해 쓴다 (reserve() 와 같은 이유).
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.record_content(wantedAuthNo, url, cloDate, contentHash)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def open_postings(self, today):
+        """마감일이 today(YYYYMMDD) 이후이거나 정해지지 않은(채용시까지 등) 공고의 상세 url"""
+        cursor = self.conn.execute("SELECT url FROM postings WHERE cloDate = '' OR cloDate >= ? ORDER BY wantedAuthNo", (today,))
+        return [row[0] for row in cursor]
+
+    def get_state(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO state VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False)))
+
+    def commit(self):
+        if self.conn.in_transaction:
+            self.conn.commit()
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+
+# 담당자 이메일 칸에서 주소만 골라낸다 ("비공개", 공백, 여러 개 등)
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+
+
+def normalize_emails(text):
+    emails = []
+    for email in EMAIL_PATTERN.findall(text or ""):
+        email = email.lower()
+        if email not in emails:
+            emails.append(email)
+    return emails
+
+
+class EmailIndex:
+    """수신자 이메일 인덱스.
+
+    소문자로 정리한 주소마다 처음/마지막으로 본 시각과 공고를 sqlite 에 남기고,
+    실행 시 주소 set 을 한 번만 읽어 중복 확인은 메모리에서 한다.
+    new_since() 로 어떤 실행 이후 처음 나온 주소만 바로 뽑을 수 있다.
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS emails ("
+            "email TEXT PRIMARY KEY, "
+            "firstSeen TEXT NOT NULL, "
+            "lastSeen TEXT NOT NULL, "
+            "firstPosting TEXT, "
+            "lastPosting TEXT, "
+            "postings INTEGER NOT NULL DEFAULT 1)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS emails_firstSeen ON emails (firstSeen)")
+        self._emails = {row[0] for row in self.conn.execute("SELECT email FROM emails")}
+
+    def __contains__(self, email):
+        return email in self._emails
+
+    def __len__(self):
+        return len(self._emails)
+
+    def add(self, text, wantedAuthNo=None):
+        """text 안의 주소를 기록하고, 이번에 처음 본 주소 목록을 돌려준다"""
+        newEmails = []
+        seenAt = now_text()
+        for email in normalize_emails(text):
+            if email not in self._emails:
+                self._emails.add(email)
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO emails VALUES (?, ?, ?, ?, ?, 1)",
+                    (email, seenAt, seenAt, wantedAuthNo, wantedAuthNo),
+                )
+                # 다른 샤드 프로세스가 먼저 넣었으면 새 주소가 아니다
+                if cursor.rowcount == 1:
+                    newEmails.append(email)
+                    continue
+
+            # 같은 공고를 다시 처리할 때(--resume)는 세지 않는다
+            self.conn.execute(
+                "UPDATE emails SET lastSeen = ?, lastPosting = ?, postings = postings + 1 WHERE email = ? AND lastPosting IS NOT ?",
+                (seenAt, wantedAuthNo, email, wantedAuthNo),
+            )
+        return newEmails
+
+    def first_posting(self, email):
+        row = self.conn.execute("SELECT firstPosting FROM emails WHERE email = ?", (email,)).fetchone()
+        return row[0] if row else None
+
+    def new_since(self, since):
+        """since (실행 시작 시각, ISO 형식) 이후 처음 나온 주소를 처음 본 순서대로"""
+        return [row[0] for row in self.conn.execute("SELECT email FROM emails WHERE firstSeen >= ? ORDER BY firstSeen, rowid", (since,))]
+
+    def close(self):
+        self.conn.close()
+
+
+# 새 주소만 내보내기
+# python jobdata_store.py <seenIndex.db> --since 2024-05-01T09:00:00 [--output newEmails.csv]
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="이메일 인덱스에서 어떤 시점 이후 처음 나온 주소만 내보내기")
+    argParser.add_argument("path", help="seenIndex.db 경로")
+    argParser.add_argument("--since", required=True, help="이 시각(ISO, 실행 시작 시각) 이후 처음 나온 주소")
+    argParser.add_argument("--output", help="CSV 로 저장할 경로 (없으면 화면에 출력)")
+    args = argParser.parse_args()
+
+    emailIndex = EmailIndex(args.path)
+    newEmails = emailIndex.new_since(args.since)
+    emailIndex.close()
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as outputFile:
+            writer = csv.writer(outputFile)
+            writer.writerow(["수신자 Email 주소"])
+            writer.writerows([email] for email in newEmails)
+        print(f"새 주소 {len(newEmails)} 개를 {args.output} 에 저장했습니다.")
+    else:
+        sys.stdout.write("".join(email + "\n" for email in newEmails))